@@ -0,0 +1,58 @@
+// Sharded product catalog loader.
+// data/catalog-manifest.json lists one content-hashed shard per category; shards are
+// cached as immutable, so only the small manifest is revalidated on each visit.
+// Falls back to the full data/products.json if the manifest is unavailable.
+(function () {
+    // Catalog category -> site section. Mirrors SECTIONS in core/site_catalog.py; the
+    // manifest's copy is merged in on load so new categories need no page change.
+    window.CATEGORY_SECTIONS = {
+        'Tech': 'Tech', 'Gaming': 'Tech', 'Tech Gadgets': 'Tech', 'Electronics': 'Tech',
+        'Lifestyle': 'Lifestyle', 'Life & Style': 'Lifestyle', 'Lifestyle Accessories': 'Lifestyle',
+        'Beauty': 'Lifestyle', 'Luxury Beauty': 'Lifestyle', 'Digital Music/Handmade/Videos': 'Lifestyle',
+        'Home': 'Home', 'Home Essentials': 'Home', 'Home & Auto': 'Home', 'Automotive Gear': 'Home', 'Auto': 'Home'
+    };
+
+    const MANIFEST_URL = 'data/catalog-manifest.json';
+    let manifestPromise = null;
+    const shardPromises = {};
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetch(MANIFEST_URL, { cache: 'no-cache' }).then(res => {
+                if (!res.ok) throw new Error(`catalog manifest ${res.status}`);
+                return res.json();
+            }).then(manifest => {
+                Object.assign(window.CATEGORY_SECTIONS, manifest.sections || {});
+                return manifest;
+            });
+        }
+        return manifestPromise;
+    }
+
+    function loadShard(info) {
+        if (!shardPromises[info.file]) {
+            shardPromises[info.file] = fetch(`data/${info.file}`).then(res => {
+                if (!res.ok) throw new Error(`catalog shard ${res.status}`);
+                return res.json();
+            });
+        }
+        return shardPromises[info.file];
+    }
+
+    // options.section: only shards of one site section ('Tech', 'Lifestyle', 'Home')
+    async function loadCatalog(options = {}) {
+        try {
+            const manifest = await loadManifest();
+            const shards = Object.values(manifest.shards)
+                .filter(info => !options.section || info.section === options.section);
+            const parts = await Promise.all(shards.map(loadShard));
+            return parts.flat();
+        } catch (e) {
+            console.log('Sharded catalog unavailable, loading full product list', e);
+            const res = await fetch('data/products.json');
+            return res.ok ? res.json() : [];
+        }
+    }
+
+    window.loadCatalog = loadCatalog;
+})();
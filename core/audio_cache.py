@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+TTS Audio Cache - content-addressed, compressed, size-bounded (LRU) voiceover store
+"""
+import os
+import json
+import gzip
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+log = logging.getLogger("AudioCache")
+
+DEFAULT_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", "cache/tts"))
+DEFAULT_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+
+class AudioCache:
+    """
+    Stores synthesized audio as gzip-compressed blobs keyed by
+    sha256(text, provider, model, voice). Recency is tracked with file mtimes so
+    eviction is least-recently-used once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    @staticmethod
+    def make_key(text: str, provider: str, model: str, voice: str) -> str:
+        payload = json.dumps([text.strip(), provider, model, voice], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _blob_path(self, key: str, ext: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{ext}.gz"
+
+    def _load_index(self) -> dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ TTS cache index unreadable, starting fresh: {e}")
+        return {}
+
+    def _save_index(self):
+        tmp = self.index_file.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_file)
+
+    def get(self, key: str, dest_path: Path):
+        """Restores a cached clip to dest_path. Returns dest_path on hit, None on miss."""
+        with self._lock:
+            entry = self._index.get(key)
+            blob = self._blob_path(key, entry['ext']) if entry else None
+            if not blob or not blob.exists():
+                if entry:
+                    self._index.pop(key, None)
+                self.misses += 1
+                return None
+
+            dest_path = Path(dest_path)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest_path.with_name(dest_path.name + ".part")
+            with gzip.open(blob, 'rb') as src, open(tmp, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, dest_path)
+            os.utime(blob)  # mark as recently used
+
+            self.hits += 1
+            self.seconds_saved += entry.get('gen_seconds', 0.0)
+            log.info(f"♻️ TTS cache hit ({entry.get('provider')}/{entry.get('voice')}) -> {dest_path}")
+            return dest_path
+
+    def put(self, key: str, source_path: Path, provider: str, model: str, voice: str, gen_seconds: float):
+        """Compresses source_path into the cache and evicts old entries if over budget."""
+        source_path = Path(source_path)
+        ext = source_path.suffix.lstrip('.') or 'wav'
+        blob = self._blob_path(key, ext)
+        try:
+            with self._lock:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_name(blob.name + ".part")
+                with open(source_path, 'rb') as src, gzip.open(tmp, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp, blob)
+                self._index[key] = {
+                    'ext': ext,
+                    'provider': provider,
+                    'model': model,
+                    'voice': voice,
+                    'bytes': blob.stat().st_size,
+                    'raw_bytes': source_path.stat().st_size,
+                    'gen_seconds': round(gen_seconds, 2),
+                }
+                self._evict()
+                self._save_index()
+        except Exception as e:
+            log.warning(f"⚠️ Could not cache TTS audio: {e}")
+
+    def _evict(self):
+        total = sum(e.get('bytes', 0) for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        by_age = []
+        for key, entry in self._index.items():
+            blob = self._blob_path(key, entry['ext'])
+            by_age.append((blob.stat().st_mtime if blob.exists() else 0, key, blob))
+        by_age.sort()
+        for _, key, blob in by_age:
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key).get('bytes', 0)
+            if blob.exists():
+                blob.unlink()
+            log.info(f"🧹 Evicted TTS cache entry {key[:12]}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'seconds_saved': round(self.seconds_saved, 1),
+            'entries': len(self._index),
+            'bytes': sum(e.get('bytes', 0) for e in self._index.values()),
+        }
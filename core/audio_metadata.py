@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Audio Metadata - in-process duration/sample-rate/channel probe for WAV, MP3 and ADTS AAC.
+Replaces the per-video ffprobe subprocess. Results are cached next to the audio file.
+"""
+import os
+import json
+import struct
+import logging
+from pathlib import Path
+
+log = logging.getLogger("AudioMetadata")
+
+META_VERSION = 1
+
+# MPEG audio lookup tables: [version][layer] -> kbps list; index 0 = free, 15 = bad
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+_AAC_SAMPLE_RATES = [96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350]
+
+
+class AudioMetadataError(Exception):
+    """Raised when the file is not a recognised/parsable audio container."""
+    pass
+
+
+def _info(fmt, duration_s, sample_rate, channels) -> dict:
+    return {
+        'format': fmt,
+        'duration_us': int(round(duration_s * 1_000_000)),
+        'sample_rate': sample_rate,
+        'channels': channels,
+    }
+
+
+def _parse_wav(f, file_size: int) -> dict:
+    header = f.read(12)
+    if header[:4] not in (b'RIFF', b'RF64') or header[8:12] != b'WAVE':
+        raise AudioMetadataError("Not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            body = f.read(chunk_size)
+            _, channels, sample_rate, byte_rate, block_align = struct.unpack('<HHIIH', body[:14])
+            fmt = (channels, sample_rate, byte_rate, block_align)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if not fmt:
+                raise AudioMetadataError("WAV data chunk before fmt chunk")
+            channels, sample_rate, byte_rate, block_align = fmt
+            remaining = file_size - f.tell()
+            # Streamed WAVs (e.g. from TTS APIs) often carry a placeholder size
+            if chunk_size in (0, 0xFFFFFFFF) or chunk_size > remaining:
+                chunk_size = remaining
+            if block_align:
+                duration = (chunk_size // block_align) / sample_rate
+            else:
+                duration = chunk_size / byte_rate
+            return _info('wav', duration, sample_rate, channels)
+        else:
+            f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+    raise AudioMetadataError("WAV file has no data chunk")
+
+
+def _skip_id3(f) -> int:
+    head = f.read(10)
+    if head[:3] == b'ID3' and len(head) == 10:
+        size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+        footer = 10 if head[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _mp3_header(b: bytes):
+    """Decodes a 4-byte MPEG audio frame header -> (frame_len, samples, rate, channels) or None."""
+    if len(b) < 4 or b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (b[1] >> 3) & 0x3
+    layer_bits = (b[1] >> 1) & 0x3
+    bitrate_idx = (b[2] >> 4) & 0xF
+    rate_idx = (b[2] >> 2) & 0x3
+    padding = (b[2] >> 1) & 0x1
+    channel_mode = (b[3] >> 6) & 0x3
+    if version_bits == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_idx] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    channels = 1 if channel_mode == 3 else 2
+
+    if layer == 1:
+        samples = 384
+        frame_len = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        frame_len = (samples // 8) * bitrate // sample_rate + padding
+    return frame_len, samples, sample_rate, channels
+
+
+def _parse_mp3(f, file_size: int) -> dict:
+    f.seek(_skip_id3(f))
+    data = f.read()
+    pos = 0
+    # Find the first valid frame that is followed by another valid frame (sync check)
+    while pos < len(data) - 4:
+        hdr = _mp3_header(data[pos:pos + 4])
+        if hdr and (pos + hdr[0] + 4 > len(data) or _mp3_header(data[pos + hdr[0]:pos + hdr[0] + 4])):
+            break
+        pos += 1
+    else:
+        raise AudioMetadataError("No MPEG audio frames found")
+
+    frame_len, samples, sample_rate, channels = hdr
+    # Xing/Info header carries the exact frame count for VBR files
+    for marker in (b'Xing', b'Info'):
+        idx = data.find(marker, pos, pos + frame_len)
+        if idx != -1 and idx + 12 <= len(data):
+            flags = struct.unpack('>I', data[idx + 4:idx + 8])[0]
+            if flags & 0x1:
+                frames = struct.unpack('>I', data[idx + 8:idx + 12])[0]
+                return _info('mp3', frames * samples / sample_rate, sample_rate, channels)
+
+    total_samples = 0
+    while pos < len(data) - 4:
+        hdr = _mp3_header(data[pos:pos + 4])
+        if not hdr:
+            break
+        total_samples += hdr[1]
+        pos += hdr[0]
+    return _info('mp3', total_samples / sample_rate, sample_rate, channels)
+
+
+def _parse_adts(f, file_size: int) -> dict:
+    f.seek(_skip_id3(f))
+    data = f.read()
+    pos = 0
+    frames = 0
+    sample_rate = channels = None
+    while pos + 7 <= len(data):
+        if data[pos] != 0xFF or (data[pos + 1] & 0xF6) != 0xF0:
+            if frames:
+                break
+            pos += 1
+            continue
+        rate_idx = (data[pos + 2] >> 2) & 0xF
+        if rate_idx >= len(_AAC_SAMPLE_RATES):
+            raise AudioMetadataError("Invalid ADTS sample rate index")
+        sample_rate = _AAC_SAMPLE_RATES[rate_idx]
+        channels = ((data[pos + 2] & 0x1) << 2) | (data[pos + 3] >> 6)
+        frame_len = ((data[pos + 3] & 0x3) << 11) | (data[pos + 4] << 3) | (data[pos + 5] >> 5)
+        blocks = (data[pos + 6] & 0x3) + 1
+        if frame_len < 7:
+            break
+        frames += blocks
+        pos += frame_len
+    if not frames:
+        raise AudioMetadataError("No ADTS frames found")
+    return _info('aac', frames * 1024 / sample_rate, sample_rate, channels)
+
+
+def read_audio_info(path) -> dict:
+    """Parses the container header(s) of path. Raises AudioMetadataError if unsupported."""
+    path = Path(path)
+    file_size = path.stat().st_size
+    with open(path, 'rb') as f:
+        magic = f.read(12)
+        f.seek(0)
+        if magic[:4] in (b'RIFF', b'RF64'):
+            return _parse_wav(f, file_size)
+        # ADTS sync is 0xFFF with layer bits 00; MPEG audio has non-zero layer bits
+        start = _skip_id3(f)
+        f.seek(start)
+        sync = f.read(2)
+        f.seek(0)
+        if len(sync) == 2 and sync[0] == 0xFF and (sync[1] & 0xF6) == 0xF0:
+            return _parse_adts(f, file_size)
+        return _parse_mp3(f, file_size)
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta.json")
+
+
+def probe_audio(path) -> dict:
+    """
+    Returns {'format', 'duration_us', 'sample_rate', 'channels'} for path, reusing the
+    {file}.meta.json sidecar when the file size and mtime still match.
+    """
+    path = Path(path)
+    st = path.stat()
+    meta_path = _meta_path(path)
+    if meta_path.exists():
+        try:
+            with open(meta_path, 'r') as f:
+                cached = json.load(f)
+            if (cached.get('version') == META_VERSION and cached.get('size') == st.st_size
+                    and cached.get('mtime_ns') == st.st_mtime_ns):
+                return cached['info']
+        except Exception:
+            pass
+
+    info = read_audio_info(path)
+    try:
+        with open(meta_path, 'w') as f:
+            json.dump({'version': META_VERSION, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'info': info}, f)
+    except OSError as e:
+        log.warning(f"⚠️ Could not cache audio metadata for {path.name}: {e}")
+    return info
+
+
+def duration_seconds(path) -> float:
+    return probe_audio(path)['duration_us'] / 1_000_000
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    for arg in sys.argv[1:]:
+        print(arg, read_audio_info(arg))
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Catalog Store - the product catalog (website products and processed history) in one
+indexed SQLite database instead of three hand-merged JSON files.
+
+data/products.json, amazing/data/products.json and data/processed_products.json are now
+generated exports of this store. They stay committed, so a fresh checkout (or a JSON file
+edited by another tool) is imported back into the database automatically.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from site_catalog import export_site_catalog
+
+log = logging.getLogger("CatalogStore")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+SITE_DATA_DIR = BASE_DIR / "amazing" / "data"
+DEFAULT_DB = Path(os.getenv("CATALOG_DB", DATA_DIR / "catalog.db"))
+
+# Collections: products shown on the website, and the rolling processed history
+SITE = 'site'
+HISTORY = 'history'
+HISTORY_LIMIT = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    kind         TEXT NOT NULL,
+    asin         TEXT NOT NULL,
+    seq          INTEGER NOT NULL,
+    category     TEXT,
+    processed_at TEXT,
+    title        TEXT,
+    data         TEXT NOT NULL,
+    updated_at   REAL NOT NULL,
+    PRIMARY KEY (kind, asin)
+);
+CREATE INDEX IF NOT EXISTS idx_products_asin ON products (asin);
+CREATE INDEX IF NOT EXISTS idx_products_category ON products (kind, category);
+CREATE INDEX IF NOT EXISTS idx_products_processed_at ON products (kind, processed_at);
+CREATE INDEX IF NOT EXISTS idx_products_seq ON products (kind, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT = (
+    "INSERT INTO products (kind, asin, seq, category, processed_at, title, data, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (kind, asin) DO UPDATE SET category = excluded.category, "
+    "processed_at = excluded.processed_at, title = excluded.title, data = excluded.data, "
+    "updated_at = excluded.updated_at"
+)
+
+
+def _signature(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+class CatalogStore:
+    """
+    Each collection keeps insertion order (seq), so exports list products exactly as the
+    old JSON files did. Updating an existing ASIN keeps its position.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB, data_dir: Path = DATA_DIR, site_dir: Path = SITE_DATA_DIR):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.site_dir = Path(site_dir)
+        # First file of each list is the one re-imported when it changes outside the store
+        self.exports = {
+            SITE: [self.site_dir / "products.json", Path(data_dir) / "products.json"],
+            HISTORY: [Path(data_dir) / "processed_products.json"],
+        }
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._sync_from_exports()
+
+    # ─── IMPORT / EXPORT ─────────────────────────────────────────────
+
+    def _sync_from_exports(self):
+        for kind, paths in self.exports.items():
+            source = next((p for p in paths if p.exists()), None)
+            if source is None:
+                continue
+            signature = _signature(source)
+            with self._lock:
+                row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (f"export:{kind}",)).fetchone()
+            if self.count(kind) and row and row['value'] == signature:
+                continue
+            try:
+                with open(source, 'r') as f:
+                    products = json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ Could not import {source}: {e}")
+                continue
+            if not isinstance(products, list):
+                continue
+            self.replace(kind, products)
+            self._set_meta(f"export:{kind}", signature)
+            log.info(f"📥 Catalog: imported {self.count(kind)} {kind} products from {source}")
+
+    def _set_meta(self, key: str, value: str):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def export(self, kind: str = None):
+        """
+        Regenerates the JSON file(s) for one collection (or all) atomically. The website
+        collection also gets its sharded, precompressed site catalog (site_catalog.py).
+        """
+        for k in ([kind] if kind else list(self.exports)):
+            products = self.products(k)
+            for path in self.exports[k]:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_suffix('.tmp')
+                    with open(tmp, 'w') as f:
+                        json.dump(products, f, indent=2)
+                    os.replace(tmp, path)
+                except OSError as e:
+                    log.warning(f"⚠️ Could not export {k} catalog to {path}: {e}")
+            primary = self.exports[k][0]
+            if primary.exists():
+                self._set_meta(f"export:{k}", _signature(primary))
+            if k == SITE:
+                try:
+                    export_site_catalog(products, self.site_dir)
+                except Exception as e:
+                    log.warning(f"⚠️ Site catalog export failed: {e}")
+
+    # ─── WRITES ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def _row(kind: str, seq: int, product: dict, now: float) -> tuple:
+        return (kind, product['asin'], seq, product.get('category'), product.get('processed_at'),
+                product.get('title'), json.dumps(product, default=str), now)
+
+    def _next_seq(self, kind: str) -> int:
+        row = self.conn.execute("SELECT MAX(seq) AS seq FROM products WHERE kind = ?", (kind,)).fetchone()
+        return (row['seq'] or 0) + 1
+
+    def upsert_many(self, kind: str, products: list) -> int:
+        """Inserts or updates products by ASIN. Returns how many were written."""
+        products = [p for p in products if isinstance(p, dict) and p.get('asin')]
+        now = time.time()
+        with self._lock, self.conn:
+            seq = self._next_seq(kind)
+            self.conn.executemany(UPSERT, [self._row(kind, seq + i, p, now) for i, p in enumerate(products)])
+        return len(products)
+
+    def upsert(self, kind: str, product: dict) -> bool:
+        return self.upsert_many(kind, [product]) == 1
+
+    def add_if_missing(self, kind: str, product: dict) -> bool:
+        """Appends product unless its ASIN is already in the collection. True if added."""
+        if not product.get('asin'):
+            return False
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO products (kind, asin, seq, category, processed_at, title, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._row(kind, self._next_seq(kind), product, time.time()))
+        return cur.rowcount == 1
+
+    def replace(self, kind: str, products: list):
+        """Replaces a whole collection in one transaction (first occurrence of an ASIN sets its position)."""
+        products = [p for p in products if isinstance(p, dict) and p.get('asin')]
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM products WHERE kind = ?", (kind,))
+            self.conn.executemany(UPSERT, [self._row(kind, i + 1, p, now) for i, p in enumerate(products)])
+
+    def patch(self, kind: str, asin: str, **fields) -> bool:
+        """Updates some fields of one stored product. False if the ASIN isn't there."""
+        product = self.get(kind, asin)
+        if product is None:
+            return False
+        product.update(fields)
+        return self.upsert(kind, product)
+
+    def trim(self, kind: str, keep: int):
+        """Drops all but the `keep` most recently added products of a collection."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM products WHERE kind = ? AND seq NOT IN "
+                "(SELECT seq FROM products WHERE kind = ? ORDER BY seq DESC LIMIT ?)", (kind, kind, keep))
+
+    # ─── READS ───────────────────────────────────────────────────────
+
+    def get(self, kind: str, asin: str) -> dict:
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM products WHERE kind = ? AND asin = ?", (kind, asin)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    def products(self, kind: str) -> list:
+        return self.query(kind)
+
+    def query(self, kind: str, category: str = None, since=None, limit: int = None) -> list:
+        """
+        Products of a collection in catalog order, optionally filtered by category and by
+        processed_at >= since (ISO string or datetime). limit keeps the most recent ones.
+        """
+        clauses, params = ["kind = ?"], [kind]
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if since is not None:
+            clauses.append("processed_at >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        sql = f"SELECT data FROM products WHERE {' AND '.join(clauses)} ORDER BY seq DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [json.loads(r['data']) for r in reversed(rows)]
+
+    def count(self, kind: str = None) -> int:
+        with self._lock:
+            if kind:
+                row = self.conn.execute("SELECT COUNT(*) AS n FROM products WHERE kind = ?", (kind,)).fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(DISTINCT asin) AS n FROM products").fetchone()
+        return row['n']
+
+    def all_asins(self) -> set:
+        """Every ASIN on the website or in the processed history."""
+        with self._lock:
+            rows = self.conn.execute("SELECT DISTINCT asin FROM products").fetchall()
+        return {r['asin'] for r in rows}
+
+    def recent_asins(self, days: int = 7) -> list:
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT asin FROM products WHERE kind = ? AND processed_at >= ? ORDER BY seq",
+                (HISTORY, cutoff)).fetchall()
+        return [r['asin'] for r in rows]
+
+    def category_counts(self, kind: str = SITE) -> dict:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT category, COUNT(*) AS n FROM products WHERE kind = ? GROUP BY category", (kind,)).fetchall()
+        return {r['category']: r['n'] for r in rows}
+
+    def close(self):
+        self.conn.close()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogStore:
+    """Process-wide store shared by the pipeline steps and the strategy monitor."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = CatalogStore()
+        return _catalog
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local Category Classifier - TF-IDF + linear (softmax) model trained on our own catalog
+"""
+import os
+import re
+import json
+import math
+import hashlib
+import logging
+from pathlib import Path
+
+log = logging.getLogger("CategoryClassifier")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+# Committed artifact: read-only at runtime, rewritten only by `--train`
+MODEL_PATH = DATA_DIR / "category_model.json"
+# Untracked model retrained at runtime when the catalog has moved on from MODEL_PATH
+RUNTIME_MODEL_PATH = BASE_DIR / "cache" / "category_model.json"
+TRAINING_FILES = [DATA_DIR / "products.json", DATA_DIR / "processed_products.json"]
+
+CATEGORIES = ["Tech", "Life & Style", "Home & Auto"]
+DEFAULT_CATEGORY = "Life & Style"
+MODEL_VERSION = 1
+
+# Below this confidence the LLM selector (if any) gets the final word
+CONFIDENCE_THRESHOLD = float(os.getenv("CATEGORY_CONFIDENCE_THRESHOLD", "0.6"))
+
+# Used only when no trained model is available (empty catalog)
+KEYWORD_RULES = [
+    ("Tech", ['laptop', 'phone', 'tablet', 'headphone', 'camera', 'gaming', 'monitor', 'keyboard', 'mouse', 'smart', 'tech', 'electronic']),
+    ("Home & Auto", ['dash', 'car', 'auto', 'vehicle']),
+]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "its",
+    "of", "on", "or", "that", "the", "this", "to", "with", "your", "you", "our", "up", "x",
+}
+
+
+def _tokenize(text: str) -> list:
+    words = [w for w in re.findall(r"[a-z0-9]+", (text or "").lower()) if len(w) > 1 and w not in STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+def _product_terms(product: dict) -> dict:
+    """Term counts for a product. The title counts double; bullets are noisier."""
+    counts = {}
+    for term in _tokenize(product.get('title', '')) * 2:
+        counts[term] = counts.get(term, 0) + 1
+    bullets = product.get('bullets') or []
+    if isinstance(bullets, list):
+        for term in _tokenize(" ".join(str(b) for b in bullets[:5])):
+            counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def _keyword_category(product: dict) -> str:
+    title = (product.get('title') or '').lower()
+    for category, words in KEYWORD_RULES:
+        if any(w in title for w in words):
+            return category
+    return DEFAULT_CATEGORY
+
+
+class LocalCategoryClassifier:
+    """
+    Multinomial logistic regression over L2-normalised TF-IDF vectors.
+    The trained model is a small JSON artifact (idf table + per-category weights).
+    """
+
+    def __init__(self, model_path: Path = MODEL_PATH):
+        self.model_path = Path(model_path)
+        self.idf = {}
+        self.weights = {}
+        self.bias = {}
+        self.fingerprint = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.idf and self.weights)
+
+    # ─── PERSISTENCE ─────────────────────────────────────────
+    def load(self) -> bool:
+        if not self.model_path.exists():
+            return False
+        try:
+            with open(self.model_path, 'r') as f:
+                model = json.load(f)
+            if model.get('version') != MODEL_VERSION:
+                log.info("ℹ️ Category model version changed, retraining required")
+                return False
+            self.idf = model['idf']
+            self.weights = model['weights']
+            self.bias = model['bias']
+            self.fingerprint = model.get('fingerprint')
+            return True
+        except Exception as e:
+            log.warning(f"⚠️ Could not load category model: {e}")
+            return False
+
+    def save(self):
+        model = {
+            'version': MODEL_VERSION,
+            'fingerprint': self.fingerprint,
+            'categories': CATEGORIES,
+            'idf': {t: round(v, 4) for t, v in self.idf.items()},
+            'weights': {c: {t: round(w, 4) for t, w in ws.items() if abs(w) >= 1e-3} for c, ws in self.weights.items()},
+            'bias': {c: round(b, 4) for c, b in self.bias.items()},
+        }
+        self.model_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.model_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(model, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp_path, self.model_path)
+        log.info(f"💾 Category model saved to {self.model_path} ({self.model_path.stat().st_size/1024:.1f} KB)")
+
+    # ─── TRAINING ────────────────────────────────────────────
+    @staticmethod
+    def load_training_data(paths=None) -> list:
+        """Labelled products from the catalog files, deduplicated by ASIN."""
+        labelled = {}
+        for path in paths or TRAINING_FILES:
+            if not Path(path).exists():
+                continue
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                for p in data:
+                    if isinstance(p, dict) and p.get('title') and p.get('category') in CATEGORIES:
+                        labelled.setdefault(p.get('asin') or p['title'], p)
+            except Exception as e:
+                log.warning(f"⚠️ Could not read training data from {path}: {e}")
+        return list(labelled.values())
+
+    def _vectorize(self, product: dict) -> dict:
+        vec = {t: c * self.idf[t] for t, c in _product_terms(product).items() if t in self.idf}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    def train(self, products: list, epochs: int = 150, lr: float = 4.0, l2: float = 1e-3,
+              min_df: int = 2, max_features: int = 1500) -> dict:
+        """Fits the model with class-balanced full-batch gradient descent. Returns training stats."""
+        products = [p for p in products if p.get('category') in CATEGORIES]
+        if not products:
+            raise ValueError("No labelled products to train on")
+
+        docs = [_product_terms(p) for p in products]
+        df = {}
+        for terms in docs:
+            for t in terms:
+                df[t] = df.get(t, 0) + 1
+        n = len(docs)
+        vocab = sorted((t for t, d in df.items() if d >= min_df), key=lambda t: (-df[t], t))[:max_features]
+        self.idf = {t: math.log((1 + n) / (1 + df[t])) + 1.0 for t in vocab}
+
+        vectors = [self._vectorize(p) for p in products]
+        labels = [p['category'] for p in products]
+        # Life & Style is much rarer in the catalog; weight classes inversely to frequency
+        class_counts = {c: max(1, labels.count(c)) for c in CATEGORIES}
+        class_weight = {c: n / (len(CATEGORIES) * k) for c, k in class_counts.items()}
+        self.weights = {c: {} for c in CATEGORIES}
+        self.bias = {c: 0.0 for c in CATEGORIES}
+
+        for _ in range(epochs):
+            grad_w = {c: {} for c in CATEGORIES}
+            grad_b = {c: 0.0 for c in CATEGORIES}
+            for vec, label in zip(vectors, labels):
+                probs = self._softmax(vec)
+                for c in CATEGORIES:
+                    err = (probs[c] - (1.0 if c == label else 0.0)) * class_weight[label]
+                    grad_b[c] += err
+                    gw = grad_w[c]
+                    for t, v in vec.items():
+                        gw[t] = gw.get(t, 0.0) + err * v
+            for c in CATEGORIES:
+                ws = self.weights[c]
+                for t in set(ws) | set(grad_w[c]):
+                    w = ws.get(t, 0.0)
+                    ws[t] = w - lr * (grad_w[c].get(t, 0.0) / n + l2 * w)
+                self.bias[c] -= lr * grad_b[c] / n
+
+        correct = sum(1 for vec, label in zip(vectors, labels) if self._best(self._softmax(vec))[0] == label)
+        self.fingerprint = self.fingerprint_for(products)
+        stats = {'samples': n, 'vocabulary': len(self.idf), 'train_accuracy': round(correct / n, 3)}
+        log.info(f"🧠 Category model trained: {stats}")
+        return stats
+
+    @staticmethod
+    def fingerprint_for(products: list) -> str:
+        pairs = sorted(f"{p.get('asin')}:{p.get('category')}" for p in products)
+        return hashlib.sha1("|".join(pairs).encode()).hexdigest()[:16]
+
+    # ─── INFERENCE ───────────────────────────────────────────
+    def _softmax(self, vec: dict) -> dict:
+        scores = {}
+        for c in CATEGORIES:
+            ws = self.weights.get(c, {})
+            scores[c] = self.bias.get(c, 0.0) + sum(v * ws.get(t, 0.0) for t, v in vec.items())
+        top = max(scores.values())
+        exps = {c: math.exp(s - top) for c, s in scores.items()}
+        total = sum(exps.values())
+        return {c: e / total for c, e in exps.items()}
+
+    @staticmethod
+    def _best(probs: dict) -> tuple:
+        category = max(probs, key=probs.get)
+        return category, probs[category]
+
+    def predict(self, product: dict) -> tuple:
+        """Returns (category, confidence). Falls back to keyword rules without a model."""
+        if not self.ready:
+            return _keyword_category(product), 0.0
+        vec = self._vectorize(product)
+        if not vec:
+            return _keyword_category(product), 0.0
+        return self._best(self._softmax(vec))
+
+
+_classifier = None
+
+
+def get_classifier() -> LocalCategoryClassifier:
+    """
+    Process-wide classifier. Uses the committed artifact when its fingerprint matches the
+    labelled catalog, else an up-to-date runtime model from cache/, retraining that one
+    (never the committed file) when neither matches.
+    """
+    global _classifier
+    if _classifier is None:
+        training = LocalCategoryClassifier.load_training_data()
+        current = LocalCategoryClassifier.fingerprint_for(training) if training else None
+        clf = None
+        for path in (MODEL_PATH, RUNTIME_MODEL_PATH):
+            candidate = LocalCategoryClassifier(path)
+            if candidate.load() and (current is None or candidate.fingerprint == current):
+                clf = candidate
+                break
+        if clf is None:
+            clf = LocalCategoryClassifier(RUNTIME_MODEL_PATH)
+            if training:
+                log.info(f"ℹ️ Category model is out of date, retraining on {len(training)} products")
+                try:
+                    clf.train(training)
+                    clf.save()
+                except Exception as e:
+                    log.warning(f"⚠️ Category model training failed: {e}. Using keyword rules.")
+            if not clf.ready and LocalCategoryClassifier(MODEL_PATH).load():
+                # Stale committed model still beats keyword rules
+                clf = LocalCategoryClassifier(MODEL_PATH)
+                clf.load()
+        _classifier = clf
+    return _classifier
+
+
+def classify_product(product: dict, selector=None, threshold: float = None) -> str:
+    """
+    Single entry point for categorisation. Uses the local model and only asks the
+    LLM `selector` (anything with .classify_product) when confidence is below threshold.
+    """
+    threshold = CONFIDENCE_THRESHOLD if threshold is None else threshold
+    category, confidence = get_classifier().predict(product)
+    if confidence >= threshold or selector is None:
+        log.info(f"📌 Local category for {product.get('asin')}: {category} ({confidence:.2f})")
+        return category
+
+    try:
+        log.info(f"🧠 Low confidence ({confidence:.2f}) for {product.get('asin')}, asking LLM...")
+        llm_category = selector.classify_product(product)
+        if llm_category in CATEGORIES:
+            return llm_category
+        log.warning(f"⚠️ LLM returned unknown category '{llm_category}', keeping {category}")
+    except Exception as e:
+        log.warning(f"⚠️ LLM classification failed: {e}. Keeping local: {category}")
+    return category
+
+
+if __name__ == "__main__":
+    import argparse
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Train or query the local category classifier")
+    parser.add_argument("--train", action="store_true", help="Retrain from data/*.json and save the artifact")
+    parser.add_argument("--title", help="Classify a product title")
+    args = parser.parse_args()
+
+    clf = LocalCategoryClassifier()
+    if args.train:
+        clf.train(clf.load_training_data())
+        clf.save()
+    elif not clf.load():
+        clf = get_classifier()
+    if args.title:
+        print(clf.predict({'title': args.title}))
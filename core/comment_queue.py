@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Affiliate Comment Queue - posts the affiliate link comment once YouTube has finished
+processing a video. Runs on a background thread, polls with backoff and keeps pending
+comments in data/pending_comments.json so failures are retried on the next run.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+
+from youtube_quota import get_quota_ledger
+
+log = logging.getLogger("CommentQueue")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+QUEUE_FILE = Path(os.getenv("COMMENT_QUEUE_FILE", DATA_DIR / "pending_comments.json"))
+INITIAL_DELAY = 5.0
+MAX_DELAY = 120.0
+MAX_ATTEMPTS = 30
+MAX_AGE_SECS = 7 * 24 * 3600
+# How long the end of a run waits for outstanding comments before leaving them for the next run
+DRAIN_TIMEOUT = float(os.getenv("COMMENT_QUEUE_WAIT_SECS", "180"))
+
+COMMENT_TEMPLATE = "🔥 Get it here: {link}\n\n#coolfinds #amazonfinds #techdeals"
+
+
+class AffiliateCommentQueue:
+    def __init__(self, credentials, queue_file: Path = QUEUE_FILE):
+        self.credentials = credentials
+        self.queue_file = Path(queue_file)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._service = None
+        self.items = self._load()
+        self.posted = 0
+        if self.items:
+            log.info(f"💬 {len(self.items)} affiliate comments pending from previous runs")
+            self._start()
+
+    def _load(self) -> list:
+        if self.queue_file.exists():
+            try:
+                with open(self.queue_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ Comment queue unreadable, starting empty: {e}")
+        return []
+
+    def _save(self):
+        try:
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.queue_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self.items, f, indent=2)
+            os.replace(tmp, self.queue_file)
+        except OSError as e:
+            log.warning(f"⚠️ Could not persist comment queue: {e}")
+
+    def enqueue(self, video_id: str, affiliate_link: str):
+        """Schedules the affiliate comment for video_id; returns immediately."""
+        now = time.time()
+        with self._lock:
+            if any(item['video_id'] == video_id for item in self.items):
+                return
+            self.items.append({
+                'video_id': video_id,
+                'affiliate_link': affiliate_link,
+                'created_at': now,
+                'next_attempt_at': now + INITIAL_DELAY,
+                'delay': INITIAL_DELAY,
+                'attempts': 0,
+                'last_error': None,
+            })
+            self._save()
+        log.info(f"💬 Affiliate comment queued for {video_id}")
+        self._start()
+        self._wake.set()
+
+    def _youtube(self):
+        # Own client: the uploader's service object is not safe to share across threads
+        if self._service is None:
+            from googleapiclient.discovery import build
+            self._service = build("youtube", "v3", credentials=self.credentials)
+        return self._service
+
+    def _processing_state(self, video_id: str) -> str:
+        """'ready', 'processing' or 'failed'."""
+        get_quota_ledger().record('videos.list')
+        response = self._youtube().videos().list(part="status,processingDetails", id=video_id).execute()
+        items = response.get('items', [])
+        if not items:
+            return 'processing'
+        status = items[0].get('status', {}).get('uploadStatus')
+        processing = items[0].get('processingDetails', {}).get('processingStatus')
+        if status in ('failed', 'rejected', 'deleted') or processing in ('failed', 'terminated'):
+            return 'failed'
+        if status == 'processed' or processing == 'succeeded':
+            return 'ready'
+        return 'processing'
+
+    def _post(self, item: dict) -> bool:
+        body = {
+            'snippet': {
+                'videoId': item['video_id'],
+                'topLevelComment': {'snippet': {'textOriginal': COMMENT_TEMPLATE.format(link=item['affiliate_link'])}}
+            }
+        }
+        get_quota_ledger().record('commentThreads.insert')
+        response = self._youtube().commentThreads().insert(part='snippet', body=body).execute()
+        return bool(response.get('id'))
+
+    def _attempt(self, item: dict) -> bool:
+        """Processes one due item. Returns True when it can be removed from the queue."""
+        try:
+            state = self._processing_state(item['video_id'])
+            if state == 'failed':
+                log.error(f"❌ Video {item['video_id']} failed processing, dropping affiliate comment")
+                return True
+            if state == 'ready':
+                if self._post(item):
+                    self.posted += 1
+                    log.info(f"✅ Affiliate comment posted on {item['video_id']} "
+                             f"({time.time() - item['created_at']:.0f}s after upload)")
+                    return True
+                item['last_error'] = "comment insert returned no id"
+                item['attempts'] += 1
+        except Exception as e:
+            item['last_error'] = str(e)
+            item['attempts'] += 1
+            log.warning(f"⚠️ Affiliate comment for {item['video_id']} failed (attempt {item['attempts']}): {e}")
+
+        if item['attempts'] >= MAX_ATTEMPTS or time.time() - item['created_at'] > MAX_AGE_SECS:
+            log.error(f"❌ Giving up on affiliate comment for {item['video_id']}: {item['last_error']}")
+            return True
+        item['delay'] = min(item['delay'] * 2, MAX_DELAY)
+        item['next_attempt_at'] = time.time() + item['delay']
+        return False
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self.items:
+                    self._thread = None
+                    return
+                now = time.time()
+                due = [item for item in self.items if item['next_attempt_at'] <= now]
+                next_at = min(item['next_attempt_at'] for item in self.items)
+            if not due:
+                self._wake.wait(timeout=max(0.0, next_at - time.time()))
+                self._wake.clear()
+                continue
+            for item in due:
+                done = self._attempt(item)
+                with self._lock:
+                    if done:
+                        self.items.remove(item)
+                    self._save()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="affiliate-comments", daemon=True)
+                self._thread.start()
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT) -> int:
+        """Waits up to timeout for outstanding comments. Returns how many remain queued."""
+        thread = self._thread
+        if thread is not None:
+            log.info(f"💬 Waiting up to {timeout:.0f}s for {len(self.items)} affiliate comments...")
+            thread.join(timeout)
+        with self._lock:
+            remaining = len(self.items)
+            self._save()
+        if remaining:
+            log.warning(f"⏳ {remaining} affiliate comments left for the next run")
+        return remaining
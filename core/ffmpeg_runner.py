@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+FFmpeg Runner - argument-list ffmpeg invocation with live -progress parsing,
+wall-clock timeouts and per-encode metrics (fps, speed, bitrate, CPU time).
+"""
+import os
+import time
+import logging
+import threading
+import subprocess
+from pathlib import Path
+
+log = logging.getLogger("FFmpegRunner")
+
+DEFAULT_TIMEOUT = float(os.getenv("FFMPEG_TIMEOUT_SECS", "600"))
+PROGRESS_LOG_INTERVAL = 5.0
+
+
+def _parse_time_us(value: str):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def run_ffmpeg(args: list, output_path=None, timeout: float = DEFAULT_TIMEOUT,
+               expected_duration: float = None, label: str = "ffmpeg") -> dict:
+    """
+    Runs `ffmpeg <args>` without a shell. Every element of args is passed verbatim,
+    so paths never need quoting. Progress is read from `-progress pipe:1` while the
+    process runs; runaway encodes are killed after `timeout` seconds.
+
+    Returns a metrics dict: ok, returncode, timed_out, wall_seconds, cpu_seconds,
+    frames, encode_fps, speed, out_seconds, bitrate_kbps, output_bytes, stderr.
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-progress", "pipe:1", *[str(a) for a in args]]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1)
+
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        log.error(f"⏱️ {label}: exceeded {timeout:g}s, killing ffmpeg (pid {proc.pid})")
+        proc.kill()
+
+    watchdog = threading.Timer(timeout, _kill)
+    watchdog.daemon = True
+    watchdog.start()
+
+    # Drain stderr concurrently so a chatty encode can't block on a full pipe
+    stderr_lines = []
+    stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(proc.stderr), daemon=True)
+    stderr_thread.start()
+
+    progress = {}
+    last_log = start
+    for line in proc.stdout:
+        key, _, value = line.strip().partition("=")
+        if not key:
+            continue
+        progress[key] = value
+        if key == "progress":
+            now = time.perf_counter()
+            if value != "end" and now - last_log >= PROGRESS_LOG_INTERVAL:
+                last_log = now
+                out_us = _parse_time_us(progress.get("out_time_us"))
+                pct = ""
+                if expected_duration and out_us:
+                    pct = f" {min(100.0, out_us / 1e4 / expected_duration):.0f}%"
+                log.info(f"⏳ {label}:{pct} frame={progress.get('frame')} fps={progress.get('fps')} speed={progress.get('speed')}")
+
+    # wait4 gives this child's own rusage, which stays correct with concurrent encodes
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    watchdog.cancel()
+    stderr_thread.join(timeout=5)
+    wall = time.perf_counter() - start
+
+    frames = int(progress.get("frame") or 0)
+    out_us = _parse_time_us(progress.get("out_time_us")) or 0
+    out_seconds = out_us / 1_000_000
+    output_bytes = 0
+    if output_path and Path(output_path).exists():
+        output_bytes = Path(output_path).stat().st_size
+
+    metrics = {
+        "ok": proc.returncode == 0 and not timed_out.is_set(),
+        "returncode": proc.returncode,
+        "timed_out": timed_out.is_set(),
+        "wall_seconds": round(wall, 2),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 2),
+        "frames": frames,
+        "encode_fps": round(frames / wall, 1) if wall > 0 else 0.0,
+        "speed": round(out_seconds / wall, 2) if wall > 0 else 0.0,
+        "out_seconds": round(out_seconds, 3),
+        "bitrate_kbps": round(output_bytes * 8 / 1000 / out_seconds, 1) if out_seconds > 0 else 0.0,
+        "output_bytes": output_bytes,
+        "stderr": "".join(stderr_lines[-40:]),
+    }
+    if metrics["ok"]:
+        log.info(f"📈 {label}: {frames} frames in {metrics['wall_seconds']}s "
+                 f"({metrics['encode_fps']} fps, {metrics['speed']}x, {metrics['bitrate_kbps']} kbps, "
+                 f"cpu {metrics['cpu_seconds']}s)")
+    return metrics
@@ -4,6 +4,10 @@ import logging
 from groq import Groq, RateLimitError, InternalServerError, APIStatusError
 from pathlib import Path
 import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from audio_cache import AudioCache
+from tts_chunking import split_sentences, crossfade_wavs, save_chunk_timestamps
 
 class GroqQuotaExceeded(Exception):
     """Custom exception when API quota is empty"""
@@ -107,7 +111,7 @@ class GroqScriptGenerator:
         return None
 
 class GroqVoiceGenerator:
-    def __init__(self, api_key):
+    def __init__(self, api_key, voice_dir: Path = None):
         self.api_key = api_key.strip() if api_key else ""
         import httpx
         self.client = Groq(
@@ -117,6 +121,15 @@ class GroqVoiceGenerator:
         )
         self.model = "canopylabs/orpheus-v1-english"
         self.voice = "diana"
+        self.openai_model = "tts-1"
+        self.openai_voice = "alloy"
+        self.cache = AudioCache()
+        # Optional sentence-chunked mode: chunks are synthesized in parallel and crossfaded
+        self.chunked = os.environ.get("TTS_CHUNKED", "").lower() in ("1", "true", "yes")
+        self.chunk_workers = int(os.environ.get("TTS_CHUNK_WORKERS", "4"))
+        self.last_chunk_timestamps = []
+        # Where voice files are written (a per-run scratch dir when run by the pipeline)
+        self.voice_dir = Path(voice_dir) if voice_dir else Path("assets")
         self.openai_api_key = os.environ.get("OPENAI_API_KEY", "").strip()
         if self.openai_api_key:
             log.info("✅ OpenAI TTS fallback configured")
@@ -129,10 +142,15 @@ class GroqVoiceGenerator:
             log.error("❌ OpenAI credentials not configured")
             return None
         
-        assets_dir = Path("assets")
+        assets_dir = self.voice_dir
         assets_dir.mkdir(parents=True, exist_ok=True)
         output_path = assets_dir / f"{asin}_voice.wav"
         
+        cache_key = self.cache.make_key(text, "openai", self.openai_model, self.openai_voice)
+        if self.cache.get(cache_key, output_path):
+            return output_path
+        
+        start = time.time()
         try:
             import httpx
             with httpx.Client(timeout=60.0) as client:
@@ -143,15 +161,16 @@ class GroqVoiceGenerator:
                         "Content-Type": "application/json"
                     },
                     json={
-                        "model": "tts-1",
+                        "model": self.openai_model,
                         "input": text,
-                        "voice": "alloy",
+                        "voice": self.openai_voice,
                         "response_format": "wav"
                     }
                 )
                 if response.status_code == 200:
                     with open(output_path, 'wb') as f:
                         f.write(response.content)
+                    self.cache.put(cache_key, output_path, "openai", self.openai_model, self.openai_voice, time.time() - start)
                     log.info(f"✅ OpenAI TTS Voiceover saved to {output_path}")
                     log.info(f"🔄 Voice fallback: OpenAI used for {asin}")
                     return output_path
@@ -162,14 +181,105 @@ class GroqVoiceGenerator:
             log.error(f"❌ OpenAI TTS generation failed: {e}")
             return None
 
-    def generate(self, text: str, asin: str):
+    def _synthesize_chunk(self, text: str, path: Path):
+        """Single Groq request for one sentence chunk (cached). Raises on failure."""
+        cache_key = self.cache.make_key(text, "groq", self.model, self.voice)
+        if self.cache.get(cache_key, path):
+            return path
+        start = time.time()
+        response = self.client.audio.speech.create(
+            model=self.model,
+            voice=self.voice,
+            response_format="wav",
+            input=text,
+            timeout=30.0
+        )
+        with open(path, 'wb') as f:
+            if hasattr(response, 'iter_bytes'):
+                for chunk in response.iter_bytes(): f.write(chunk)
+            else:
+                f.write(response.read())
+        self.cache.put(cache_key, path, "groq", self.model, self.voice, time.time() - start)
+        return path
+
+    def generate_chunked(self, text: str, asin: str):
+        """
+        Splits narration into sentences, synthesizes them concurrently and joins them
+        with short crossfades. Only failed chunks are retried. Chunk timestamps are saved
+        next to the voice file for caption timing. Returns None if any chunk keeps failing.
+        """
+        chunks = split_sentences(text)
+        if len(chunks) < 2:
+            return None
+
+        assets_dir = self.voice_dir
+        chunk_dir = assets_dir / f"{asin}_chunks"
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        neural_path = assets_dir / f"{asin}_voice.wav"
+        paths = [chunk_dir / f"{i:02d}.wav" for i in range(len(chunks))]
+
+        log.info(f"🗣️  Generating chunked Groq voiceover for {asin} ({len(chunks)} sentences)...")
+        pending = list(range(len(chunks)))
+        for attempt in range(3):
+            failed = []
+            with ThreadPoolExecutor(max_workers=min(self.chunk_workers, len(pending))) as pool:
+                futures = {pool.submit(self._synthesize_chunk, chunks[i], paths[i]): i for i in pending}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        log.warning(f"⚠️ Voice chunk {i+1}/{len(chunks)} failed (attempt {attempt+1}/3): {e}")
+                        failed.append(i)
+            pending = sorted(failed)
+            if not pending:
+                break
+            time.sleep(2 ** attempt)
+
+        if pending:
+            log.error(f"❌ {len(pending)} voice chunks failed for {asin}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return None
+
+        try:
+            timestamps = crossfade_wavs(paths, neural_path)
+        except Exception as e:
+            log.error(f"❌ Could not assemble voice chunks for {asin}: {e}")
+            return None
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+        save_chunk_timestamps(neural_path, chunks, timestamps)
+        self.last_chunk_timestamps = [{"text": t, "start": s, "end": e} for t, (s, e) in zip(chunks, timestamps)]
+        log.info(f"✅ Chunked Groq Voiceover saved to {neural_path} ({timestamps[-1][1]:.2f}s)")
+        return neural_path
+
+    def generate(self, text: str, asin: str, chunked: bool = None):
         """
-        Generates voiceover audio. Tries Groq first, falls back to ElevenLabs on quota/rate limit.
+        Generates voiceover audio. Tries Groq first, falls back to OpenAI on quota/rate limit.
+        Identical narration/voice/model combinations are served from the TTS cache.
+        With chunked=True (or TTS_CHUNKED=1) sentences are synthesized in parallel first.
         """
-        assets_dir = Path("assets")
+        assets_dir = self.voice_dir
         assets_dir.mkdir(parents=True, exist_ok=True)
         neural_path = assets_dir / f"{asin}_voice.wav"
         
+        self.last_chunk_timestamps = []
+        stale_chunks = assets_dir / f"{asin}_voice.chunks.json"
+        if stale_chunks.exists():
+            stale_chunks.unlink()
+        
+        if self.chunked if chunked is None else chunked:
+            chunked_path = self.generate_chunked(text, asin)
+            if chunked_path:
+                return chunked_path
+            log.warning(f"⚠️ Chunked voiceover unavailable for {asin}, using single request...")
+        
+        cache_key = self.cache.make_key(text, "groq", self.model, self.voice)
+        if self.cache.get(cache_key, neural_path):
+            return neural_path
+        
+        start = time.time()
         for attempt in range(3):
             try:
                 log.info(f"🗣️  Generating Groq Neural Voiceover (Diana) for {asin} (Attempt {attempt+1})...")
@@ -185,6 +295,7 @@ class GroqVoiceGenerator:
                         for chunk in response.iter_bytes(): f.write(chunk)
                     else:
                         f.write(response.read())
+                self.cache.put(cache_key, neural_path, "groq", self.model, self.voice, time.time() - start)
                 log.info(f"✅ Groq Neural Voiceover saved to {neural_path}")
                 return neural_path
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Image Downloader - concurrent product image fetches over one pooled HTTP/2 client
+"""
+import os
+import time
+import logging
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+log = logging.getLogger("ImageDownloader")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+
+# Magic numbers used when Pillow is not available to verify decodability
+_IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF', b'BM')
+
+
+def _is_decodable(path: Path) -> bool:
+    if Image is not None:
+        try:
+            with Image.open(path) as img:
+                img.verify()
+            return True
+        except Exception:
+            return False
+    with open(path, 'rb') as f:
+        head = f.read(12)
+    return any(head.startswith(sig) for sig in _IMAGE_SIGNATURES)
+
+
+class ImageDownloader:
+    """
+    Fetches many images concurrently through a single pooled httpx client (HTTP/2
+    multiplexes them over one TLS connection per host). Each file is streamed to a
+    temporary path, validated and then moved into place.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: float = 15.0):
+        self.max_workers = max_workers
+        self.client = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers),
+        )
+        self.last_stats = []
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fetch(self, url: str, path: Path, headers: dict = None) -> dict:
+        """
+        Downloads one URL to path. Returns a result dict with ok/status/bytes/latency
+        plus the response validators (etag, last_modified). A 304 is reported as ok
+        with not_modified=True and the existing file left untouched.
+        """
+        path = Path(path)
+        result = {'url': url, 'path': path, 'ok': False, 'status': None, 'bytes': 0,
+                  'latency': 0.0, 'not_modified': False, 'etag': None, 'last_modified': None}
+        if not url:
+            return result
+        start = time.perf_counter()
+        tmp = None
+        try:
+            with self.client.stream("GET", url, headers=headers or {}) as response:
+                result['status'] = response.status_code
+                result['etag'] = response.headers.get('etag')
+                result['last_modified'] = response.headers.get('last-modified')
+                if response.status_code == 304:
+                    result['ok'] = result['not_modified'] = True
+                    return result
+                if response.status_code != 200:
+                    log.warning(f"Could not download image: {url} - HTTP {response.status_code}")
+                    return result
+                content_type = response.headers.get('content-type', '')
+                if content_type and not content_type.startswith('image/'):
+                    log.warning(f"Skipping non-image response ({content_type}): {url}")
+                    return result
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Unique per call: other render processes may be fetching the same URL
+                fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".part")
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_bytes(64 * 1024):
+                        f.write(chunk)
+                        result['bytes'] += len(chunk)
+
+            if result['bytes'] == 0 or not _is_decodable(tmp):
+                log.warning(f"Downloaded file is not a valid image: {url}")
+                return result
+            os.replace(tmp, path)
+            result['ok'] = True
+            return result
+        except Exception as e:
+            log.warning(f"Could not download image: {url} - {e}")
+            return result
+        finally:
+            result['latency'] = time.perf_counter() - start
+            if tmp and os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def download_all(self, urls: list, paths: list) -> list:
+        """
+        Downloads urls[i] -> paths[i] concurrently. Returns the successful local paths
+        in the original order; per-image metrics are kept in self.last_stats.
+        """
+        if not urls:
+            self.last_stats = []
+            return []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            results = list(pool.map(self.fetch, urls, paths))
+        self.last_stats = results
+
+        ok = [r for r in results if r['ok']]
+        total_kb = sum(r['bytes'] for r in ok) / 1024
+        slowest = max((r['latency'] for r in results), default=0.0)
+        log.info(f"📥 Downloaded {len(ok)}/{len(urls)} images ({total_kb:.1f} KB) "
+                 f"in {time.perf_counter() - start:.2f}s (slowest {slowest:.2f}s)")
+        return [r['path'] for r in ok]
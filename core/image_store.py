@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Image Store - content-addressed product image cache shared across products and runs.
+Entries are keyed by the canonical Amazon image ID (or a URL hash), revalidated with
+ETag/Last-Modified, written atomically and evicted least-recently-used past a byte cap.
+"""
+import os
+import re
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from image_downloader import ImageDownloader
+
+log = logging.getLogger("ImageStore")
+
+DEFAULT_STORE_DIR = Path(os.getenv("IMAGE_STORE_DIR", "cache/images"))
+DEFAULT_MAX_BYTES = int(os.getenv("IMAGE_STORE_MAX_MB", "500")) * 1024 * 1024
+# Amazon image URLs are effectively immutable; only revalidate after this long
+DEFAULT_FRESH_SECS = int(os.getenv("IMAGE_STORE_FRESH_HOURS", "168")) * 3600
+
+# https://m.media-amazon.com/images/I/71AbCdEfGhL._AC_SL1500_.jpg -> amz-71AbCdEfGhL._AC_SL1500_.jpg
+AMAZON_IMAGE_RE = re.compile(r'/images/I/([A-Za-z0-9+%_-]+(?:\.[A-Za-z0-9_,-]+)*?)\.(jpg|jpeg|png|webp|gif)$', re.I)
+
+
+def image_key(url: str) -> str:
+    """
+    Canonical Amazon image ID (host-independent) or sha256 of the URL, plus the file
+    extension so ffmpeg can still pick the right image demuxer.
+    """
+    url_path = urlparse(url).path
+    match = AMAZON_IMAGE_RE.search(url_path)
+    if match:
+        return "amz-" + re.sub(r'[^A-Za-z0-9._-]', '_', match.group(1)) + "." + match.group(2).lower()
+    ext = Path(url_path).suffix.lower()
+    if ext not in ('.jpg', '.jpeg', '.png', '.webp', '.gif'):
+        ext = '.jpg'
+    return "url-" + hashlib.sha256(url.encode('utf-8')).hexdigest()[:32] + ext
+
+
+class ImageStore:
+    def __init__(self, store_dir: Path = DEFAULT_STORE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 fresh_secs: int = DEFAULT_FRESH_SECS, downloader: ImageDownloader = None):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.store_dir / "index.json"
+        # Render worker processes share the index; read-merge-write happens under this flock
+        self.lock_file = self.store_dir / "index.lock"
+        self.max_bytes = max_bytes
+        self.fresh_secs = fresh_secs
+        self.downloader = downloader
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        # Entries added or refreshed by this process since the last save
+        self._changes = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.last_stats = []
+
+    def _load_index(self) -> dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ Image store index unreadable, starting fresh: {e}")
+        return {}
+
+    @contextmanager
+    def _index_lock(self):
+        with open(self.lock_file, 'a') as lock_f:
+            fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_f.fileno(), fcntl.LOCK_UN)
+
+    def _save_index(self, keep: set = frozenset()):
+        """
+        Merges this process's changes into the on-disk index (other render processes may
+        have saved since we loaded it), evicts past the byte cap and writes it back.
+        Caller holds self._lock.
+        """
+        with self._index_lock():
+            merged = self._load_index()
+            merged.update(self._changes)
+            self._index = merged
+            self._evict(keep)
+            fd, tmp = tempfile.mkstemp(dir=self.store_dir, prefix="index.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self._index, f)
+                os.replace(tmp, self.index_file)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+        self._changes = {}
+
+    def path_for(self, key: str) -> Path:
+        shard = hashlib.sha1(key.encode('utf-8')).hexdigest()[:2]
+        return self.store_dir / shard / key
+
+    def _downloader(self) -> ImageDownloader:
+        if self.downloader is None:
+            self.downloader = ImageDownloader()
+        return self.downloader
+
+    def get(self, url: str):
+        """Returns the local path for url, fetching or revalidating as needed (None on failure)."""
+        return self._resolve(url)[0]
+
+    def _resolve(self, url: str) -> tuple:
+        """(path or None, stat dict with source/bytes/latency) for one URL."""
+        stat = {'url': url, 'source': 'failed', 'bytes': 0, 'latency': 0.0}
+        if not url:
+            return None, stat
+        key = image_key(url)
+        path = self.path_for(key)
+        with self._lock:
+            entry = self._index.get(key)
+        cached = entry is not None and path.exists()
+
+        if cached and time.time() - entry.get('checked_at', 0) < self.fresh_secs:
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            stat['source'] = 'hit'
+            return path, stat
+
+        headers = {}
+        if cached:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        result = self._downloader().fetch(url, path, headers=headers)
+        stat['latency'] = result['latency']
+        if not result['ok']:
+            # Serve a stale copy rather than failing the render
+            if cached:
+                stat['source'] = 'stale'
+                return path, stat
+            return None, stat
+
+        with self._lock:
+            if result['not_modified']:
+                self.revalidated += 1
+                stat['source'] = 'revalidated'
+                entry['checked_at'] = time.time()
+                self._changes[key] = entry
+                os.utime(path)
+            else:
+                self.downloads += 1
+                stat['source'] = 'download'
+                stat['bytes'] = result['bytes']
+                self._index[key] = self._changes[key] = {
+                    'url': url,
+                    'etag': result['etag'],
+                    'last_modified': result['last_modified'],
+                    'bytes': result['bytes'],
+                    'checked_at': time.time(),
+                }
+        return path, stat
+
+    def get_many(self, urls: list) -> list:
+        """Resolves urls concurrently. Returns a list aligned with urls (None where it failed)."""
+        if not urls:
+            return []
+        workers = min(self._downloader().max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            resolved = list(pool.map(self._resolve, urls))
+        paths = [path for path, _ in resolved]
+        self.last_stats = [stat for _, stat in resolved]
+        with self._lock:
+            try:
+                self._save_index(keep={image_key(u) for u in urls if u})
+            except OSError as e:
+                # The images are on disk; a missed index update must not fail the render
+                log.warning(f"⚠️ Could not update image store index: {e}")
+        log.info(f"🗂️ Image store: {self.hits} hits, {self.revalidated} revalidated, {self.downloads} downloaded")
+        return paths
+
+    def _evict(self, keep: set = frozenset()):
+        total = sum(e.get('bytes', 0) for e in self._index.values())
+        if total <= self.max_bytes:
+            return
+        by_age = []
+        for key in self._index:
+            path = self.path_for(key)
+            by_age.append((path.stat().st_mtime if path.exists() else 0, key, path))
+        by_age.sort()
+        for _, key, path in by_age:
+            if total <= self.max_bytes:
+                break
+            if key in keep:
+                continue
+            total -= self._index.pop(key).get('bytes', 0)
+            if path.exists():
+                path.unlink()
+
+    def close(self):
+        if self.downloader is not None:
+            self.downloader.close()
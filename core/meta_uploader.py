@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import os
-import time
 import requests
 import logging
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from public_media import get_public_media
+from status_poller import get_poller
 
 log = logging.getLogger("MetaUploader")
 
@@ -16,6 +18,20 @@ class MetaUploader:
         if not all([self.access_token, self.page_id, self.ig_account_id]):
             log.warning("Meta credentials missing in .env")
 
+        # Pooled keep-alive connections for the Graph API calls and status polls
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.ig_deadline = float(os.getenv("IG_PROCESSING_DEADLINE_SECS", "300"))
+        # media_publish runs here, never on the shared status poller thread
+        self.publisher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ig-publish")
+
+    def is_configured(self, platform: str = None) -> bool:
+        """True if the credentials for 'facebook' / 'instagram' (either one if None) are set"""
+        targets = {'facebook': self.page_id, 'instagram': self.ig_account_id}
+        ids = [targets[platform]] if platform else list(targets.values())
+        return bool(self.access_token) and any(ids)
+
     def upload_to_facebook(self, video_path: str, caption: str):
         """Uploads a Reel to a Facebook Page using the rupload flow."""
         try:
@@ -31,20 +47,28 @@ class MetaUploader:
                 log.error(f"FB Init failed: {res}")
                 return None
 
-            # 2. Upload video file
-            file_size = os.path.getsize(video_path)
-            with open(video_path, 'rb') as f:
-                headers = {
-                    'Authorization': f'OAuth {self.access_token}',
-                    'offset': '0',
-                    'file_size': str(file_size),
-                    'Content-Type': 'application/octet-stream'
-                }
-                upload_url = f"https://rupload.facebook.com/video-reels/{video_id}"
-                res = requests.post(upload_url, data=f, headers=headers).json()
+            # 2. Upload video file (FB pulls the shared public copy; bytes are streamed only as a fallback)
+            upload_url = f"https://rupload.facebook.com/video-reels/{video_id}"
+            public_url = self._get_public_url(video_path)
+            res = {}
+            if public_url:
+                headers = {'Authorization': f'OAuth {self.access_token}', 'file_url': public_url}
+                res = requests.post(upload_url, headers=headers).json()
                 if not res.get('success'):
-                    log.error(f"FB Upload failed: {res}")
-                    return None
+                    log.warning(f"FB hosted-URL upload failed, streaming file instead: {res}")
+            if not res.get('success'):
+                file_size = os.path.getsize(video_path)
+                with open(video_path, 'rb') as f:
+                    headers = {
+                        'Authorization': f'OAuth {self.access_token}',
+                        'offset': '0',
+                        'file_size': str(file_size),
+                        'Content-Type': 'application/octet-stream'
+                    }
+                    res = requests.post(upload_url, data=f, headers=headers).json()
+                    if not res.get('success'):
+                        log.error(f"FB Upload failed: {res}")
+                        return None
 
             # 3. Publish
             publish_url = f"https://graph.facebook.com/v19.0/{self.page_id}/video_reels"
@@ -66,12 +90,26 @@ class MetaUploader:
             return None
 
     def upload_to_instagram(self, video_path: str, caption: str):
-        """Uploads a Reel to Instagram Business using public URL flow."""
+        """Uploads a Reel to Instagram Business using public URL flow (blocking)."""
+        try:
+            return self.start_instagram_upload(video_path, caption).result()
+        except Exception as e:
+            log.error(f"IG Error: {e}")
+            return None
+
+    def start_instagram_upload(self, video_path: str, caption: str) -> Future:
+        """
+        Creates the IG media container and returns right away. A Future resolves to the
+        published media id once the shared status poller sees FINISHED and publishing
+        succeeds (None on failure).
+        """
+        result = Future()
         try:
             # 1. Get public URL (Instagram requires a public URL to fetch the video)
             public_url = self._get_public_url(video_path)
             if not public_url:
-                return None
+                result.set_result(None)
+                return result
 
             # 2. Create media container
             url = f"https://graph.facebook.com/v19.0/{self.ig_account_id}/media"
@@ -81,55 +119,68 @@ class MetaUploader:
                 'caption': caption,
                 'access_token': self.access_token
             }
-            res = requests.post(url, data=payload).json()
+            res = self.session.post(url, data=payload, timeout=30).json()
             creation_id = res.get('id')
             if not creation_id:
                 log.error(f"IG container failed: {res}")
-                return None
-
-            # 3. Wait for processing
-            log.info("⏳ Waiting for IG processing...")
-            status_url = f"https://graph.facebook.com/v19.0/{creation_id}"
-            params = {'fields': 'status_code', 'access_token': self.access_token}
-            for _ in range(10):
-                time.sleep(10)
-                status = requests.get(status_url, params=params).json()
-                if status.get('status_code') == 'FINISHED':
-                    break
-                log.info(f"   Status: {status.get('status_code')}")
-            else:
-                log.error("IG processing timed out")
-                return None
-
-            # 4. Publish
-            publish_url = f"https://graph.facebook.com/v19.0/{self.ig_account_id}/media_publish"
-            publish_payload = {
-                'creation_id': creation_id,
-                'access_token': self.access_token
-            }
-            res = requests.post(publish_url, data=publish_payload).json()
-            if res.get('id'):
-                log.info(f"✅ Reel published to IG: {res['id']}")
-                return res['id']
-            log.error(f"IG Publish failed: {res}")
-            return None
+                result.set_result(None)
+                return result
         except Exception as e:
             log.error(f"IG Error: {e}")
-            return None
+            result.set_result(None)
+            return result
+
+        # 3. Wait for processing in the background, publish when FINISHED
+        log.info("⏳ Waiting for IG processing...")
+        processing = get_poller().watch(
+            lambda: self._container_status(creation_id),
+            label=f"IG container {creation_id}",
+            deadline=self.ig_deadline,
+        )
+
+        def publish():
+            try:
+                result.set_result(self._publish_instagram(creation_id))
+            except Exception as e:
+                log.error(f"IG publish failed: {e}")
+                result.set_result(None)
+
+        def processed(done: Future):
+            # Runs on the poller thread: hand the blocking POST off instead of doing it here
+            try:
+                done.result()
+            except Exception as e:
+                log.error(f"IG processing failed: {e}")
+                result.set_result(None)
+                return
+            self.publisher.submit(publish)
+
+        processing.add_done_callback(processed)
+        return result
+
+    def _container_status(self, creation_id: str) -> str:
+        status_url = f"https://graph.facebook.com/v19.0/{creation_id}"
+        params = {'fields': 'status_code', 'access_token': self.access_token}
+        return self.session.get(status_url, params=params, timeout=15).json().get('status_code')
+
+    def _publish_instagram(self, creation_id: str):
+        # 4. Publish
+        publish_url = f"https://graph.facebook.com/v19.0/{self.ig_account_id}/media_publish"
+        publish_payload = {
+            'creation_id': creation_id,
+            'access_token': self.access_token
+        }
+        res = self.session.post(publish_url, data=publish_payload, timeout=30).json()
+        if res.get('id'):
+            log.info(f"✅ Reel published to IG: {res['id']}")
+            return res['id']
+        log.error(f"IG Publish failed: {res}")
+        return None
 
     def _get_public_url(self, video_path: str) -> str:
-        """Uploads video to Catbox.moe for a temporary public URL."""
+        """Public URL for the video, shared with the other uploaders (uploaded once per video)."""
         try:
-            log.info("☁️ Uploading to Catbox for public URL...")
-            url = "https://catbox.moe/user/api.php"
-            with open(video_path, 'rb') as f:
-                res = requests.post(url, data={'reqtype': 'fileupload'}, files={'fileToUpload': f}, timeout=30)
-                if res.status_code == 200:
-                    public_url = res.text.strip()
-                    log.info(f"   Public URL: {public_url}")
-                    return public_url
-            log.error(f"Catbox upload failed: {res.text}")
-            return None
+            return get_public_media().url_for(video_path)
         except Exception as e:
             log.error(f"Public URL error: {e}")
             return None
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Public Media - uploads each rendered video to a public host once and hands the same URL
+to every pull-from-URL API (Instagram video_url, Facebook file_url, TikTok PULL_FROM_URL,
+upload-post). URLs are cached per video content hash in data/public_media_urls.json.
+
+Hosts are pluggable (PUBLIC_MEDIA_HOST): 'catbox' (default) or 'local', a built-in HTTP
+server that stands in for a CDN in tests or behind a tunnel (PUBLIC_MEDIA_BASE_URL). It
+listens on 127.0.0.1 unless PUBLIC_MEDIA_LOCAL_BIND opts into a wider address.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import requests
+
+log = logging.getLogger("PublicMedia")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CACHE_FILE = Path(os.getenv("PUBLIC_MEDIA_CACHE_FILE", DATA_DIR / "public_media_urls.json"))
+CACHE_TTL = float(os.getenv("PUBLIC_MEDIA_TTL_HOURS", "72")) * 3600
+
+
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class CatboxHost:
+    """catbox.moe anonymous file hosting (what MetaUploader used per call before)."""
+    name = "catbox"
+    persistent = True
+
+    def upload(self, path: Path, digest: str) -> str:
+        with open(path, 'rb') as f:
+            res = requests.post("https://catbox.moe/user/api.php", data={'reqtype': 'fileupload'},
+                                files={'fileToUpload': f}, timeout=120)
+        if res.status_code == 200 and res.text.strip().startswith("http"):
+            return res.text.strip()
+        raise RuntimeError(f"Catbox upload failed ({res.status_code}): {res.text[:200]}")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        log.debug(format % args)
+
+
+class LocalHTTPHost:
+    """Serves published files from a local directory over HTTP (test / tunnel stand-in)."""
+    name = "local"
+    # URLs die with the server, so they are never written to the on-disk cache
+    persistent = False
+
+    def __init__(self, serve_dir: Path = None, port: int = None, base_url: str = None, bind: str = None):
+        self.serve_dir = Path(serve_dir or os.getenv("PUBLIC_MEDIA_LOCAL_DIR", "cache/public_media"))
+        self.serve_dir.mkdir(parents=True, exist_ok=True)
+        port = int(os.getenv("PUBLIC_MEDIA_LOCAL_PORT", "0")) if port is None else port
+        # Everything in serve_dir is readable by whoever can reach the port: loopback only by default
+        bind = bind or os.getenv("PUBLIC_MEDIA_LOCAL_BIND", "127.0.0.1")
+        handler = partial(_QuietHandler, directory=str(self.serve_dir))
+        self.server = ThreadingHTTPServer((bind, port), handler)
+        self.port = self.server.server_address[1]
+        self.base_url = (base_url or os.getenv("PUBLIC_MEDIA_BASE_URL") or f"http://127.0.0.1:{self.port}").rstrip("/")
+        threading.Thread(target=self.server.serve_forever, name="public-media-http", daemon=True).start()
+        log.info(f"🌐 Local media host serving {self.serve_dir} at {self.base_url} (bound to {bind})")
+
+    def upload(self, path: Path, digest: str) -> str:
+        name = f"{digest[:24]}{Path(path).suffix or '.mp4'}"
+        target = self.serve_dir / name
+        if not target.exists():
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copyfile(path, target)
+        return f"{self.base_url}/{name}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+HOSTS = {'catbox': CatboxHost, 'local': LocalHTTPHost}
+
+
+class PublicMediaService:
+    def __init__(self, host=None, cache_file: Path = CACHE_FILE, ttl: float = CACHE_TTL):
+        self.host = host or HOSTS.get(os.getenv("PUBLIC_MEDIA_HOST", "catbox"), CatboxHost)()
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._cache = self._load() if self.host.persistent else {}
+        self.uploads = 0
+        self.hits = 0
+
+    def _load(self) -> dict:
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ Public media cache unreadable, starting fresh: {e}")
+        return {}
+
+    def _save(self):
+        if not self.host.persistent:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            now = time.time()
+            live = {k: v for k, v in self._cache.items() if now - v.get('uploaded_at', 0) < self.ttl}
+            tmp = self.cache_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(live, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            log.warning(f"⚠️ Could not persist public media cache: {e}")
+
+    def url_for(self, video_path, upload: bool = True) -> str:
+        """
+        Public URL for video_path, uploading it only if this exact content has no live URL
+        yet. Concurrent callers for the same video wait for a single upload. None on failure.
+        With upload=False only an already published URL is returned (None if there is none).
+        """
+        try:
+            digest = file_digest(video_path)
+        except OSError as e:
+            log.error(f"Public media: cannot read {video_path}: {e}")
+            return None
+        key = f"{self.host.name}:{digest}"
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._cache.get(key)
+            if entry and time.time() - entry['uploaded_at'] < self.ttl:
+                self.hits += 1
+                return entry['url']
+            if not upload:
+                return None
+            try:
+                start = time.time()
+                log.info(f"☁️ Publishing {Path(video_path).name} to {self.host.name}...")
+                url = self.host.upload(Path(video_path), digest)
+            except Exception as e:
+                log.error(f"Public media upload failed: {e}")
+                return None
+            self.uploads += 1
+            log.info(f"   Public URL: {url} ({time.time() - start:.1f}s)")
+            with self._lock:
+                self._cache[key] = {'url': url, 'uploaded_at': time.time(), 'bytes': os.path.getsize(video_path)}
+                self._save()
+            return url
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_public_media() -> PublicMediaService:
+    """Process-wide service so every uploader shares one cache and one upload per video."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PublicMediaService()
+        return _service
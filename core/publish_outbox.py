@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Publish Outbox - durable record of every (video, platform) publish job in SQLite.
+Failed uploads stay pending with backoff and are retried by the next run against the
+already-rendered MP4, without repeating any LLM, TTS or ffmpeg work.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+from public_media import file_digest
+
+log = logging.getLogger("PublishOutbox")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_DB = Path(os.getenv("PUBLISH_OUTBOX_DB", DATA_DIR / "publish_outbox.db"))
+MAX_ATTEMPTS = int(os.getenv("PUBLISH_MAX_ATTEMPTS", "5"))
+RETRY_BASE_SECS = 15 * 60
+# Jobs left 'in_progress' this long were interrupted by a crash and are retried
+STALE_IN_PROGRESS_SECS = 2 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publish_jobs (
+    idempotency_key TEXT PRIMARY KEY,
+    asin            TEXT NOT NULL,
+    platform        TEXT NOT NULL,
+    video_path      TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    state           TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    result          TEXT,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL,
+    next_attempt_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_publish_jobs_due ON publish_jobs (state, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_publish_jobs_asin ON publish_jobs (asin);
+"""
+
+
+class PublishOutbox:
+    """
+    Job states: pending -> in_progress -> done, or back to pending (with backoff) on
+    failure until MAX_ATTEMPTS, then failed. The idempotency key is platform + ASIN +
+    video content hash, so the same video is never published twice to one platform.
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def make_key(asin: str, platform: str, video_path) -> str:
+        return f"{platform}:{asin}:{file_digest(video_path)[:32]}"
+
+    def enqueue(self, asin: str, platform: str, video_path, payload: dict) -> str:
+        """Records a publish job (no-op if the key already exists). Returns its key."""
+        key = self.make_key(asin, platform, video_path)
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO publish_jobs (idempotency_key, asin, platform, video_path, payload, "
+                "created_at, updated_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, asin, platform, str(video_path), json.dumps(payload, default=str), now, now, now))
+        return key
+
+    def state(self, key: str) -> str:
+        with self._lock:
+            row = self.conn.execute("SELECT state FROM publish_jobs WHERE idempotency_key = ?", (key,)).fetchone()
+        return row['state'] if row else None
+
+    def mark_started(self, key: str):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE publish_jobs SET state = 'in_progress', attempts = attempts + 1, updated_at = ? "
+                "WHERE idempotency_key = ?", (time.time(), key))
+
+    def complete(self, key: str, result=None):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE publish_jobs SET state = 'done', result = ?, last_error = NULL, updated_at = ? "
+                "WHERE idempotency_key = ?", (json.dumps(result, default=str), time.time(), key))
+
+    def fail(self, key: str, error: str):
+        """Back to pending with exponential backoff, or 'failed' once attempts run out."""
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT attempts FROM publish_jobs WHERE idempotency_key = ?", (key,)).fetchone()
+            if not row:
+                return
+            attempts = row['attempts']
+            state = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+            next_at = now + RETRY_BASE_SECS * (2 ** max(0, attempts - 1))
+            self.conn.execute(
+                "UPDATE publish_jobs SET state = ?, last_error = ?, updated_at = ?, next_attempt_at = ? "
+                "WHERE idempotency_key = ?", (state, (error or '')[:500], now, next_at, key))
+        if state == 'failed':
+            log.error(f"❌ Giving up on {key} after {attempts} attempts: {error}")
+
+    def defer(self, key: str, until: float, reason: str):
+        """Parks a job until `until` (epoch seconds) without counting it as a failed attempt."""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE publish_jobs SET state = 'pending', last_error = ?, updated_at = ?, next_attempt_at = ? "
+                "WHERE idempotency_key = ?", (reason, time.time(), until, key))
+
+    def due(self, limit: int = 50) -> list:
+        """Pending jobs whose retry time has come (plus crashed in-progress ones), oldest first."""
+        now = time.time()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM publish_jobs WHERE (state = 'pending' AND next_attempt_at <= ?) "
+                "OR (state = 'in_progress' AND updated_at <= ?) ORDER BY created_at LIMIT ?",
+                (now, now - STALE_IN_PROGRESS_SECS, limit)).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['payload'] = json.loads(job['payload'])
+            if not Path(job['video_path']).exists():
+                with self._lock:
+                    self.conn.execute(
+                        "UPDATE publish_jobs SET state = 'failed', last_error = 'video file missing', updated_at = ? "
+                        "WHERE idempotency_key = ?", (now, job['idempotency_key']))
+                continue
+            jobs.append(job)
+        return jobs
+
+    def pending_videos(self) -> list:
+        """Video paths still needed by unfinished jobs (kept safe from workspace eviction)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT asin, video_path FROM publish_jobs WHERE state IN ('pending', 'in_progress')").fetchall()
+        return [(r['asin'], r['video_path']) for r in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) AS n FROM publish_jobs GROUP BY state").fetchall()
+        return {r['state']: r['n'] for r in rows}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Render Scheduler - renders several product videos concurrently in a process pool
+"""
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+log = logging.getLogger("RenderScheduler")
+
+# Fresh interpreters per worker: forking the pipeline would copy its threads (status poller,
+# IG publisher), open SQLite connections and held locks into every render process
+MP_START_METHOD = os.getenv("RENDER_START_METHOD", "spawn")
+
+
+def _render_job(index: int, product: dict, script: dict, voice_path: str, threads: int, temp_dir: str = None) -> dict:
+    """Runs in a worker process: one VideoGenerator render. Arguments and result are plain picklable data."""
+    from video_generator import VideoGenerator
+
+    start = time.perf_counter()
+    generator = VideoGenerator(threads=threads, temp_dir=temp_dir)
+    try:
+        video_path = generator.generate(product, script, voice_path=voice_path)
+        error = None if video_path else "render returned no output"
+    except Exception as e:
+        video_path, error = None, str(e)
+    return {
+        'index': index,
+        'asin': product.get('asin'),
+        'video_path': video_path,
+        'error': error,
+        'seconds': round(time.perf_counter() - start, 2),
+        'encode': generator.last_encode_metrics,
+        'artifacts': generator.last_artifacts,
+    }
+
+
+class RenderScheduler:
+    """
+    Takes a batch of {'product', 'script', 'voice_path'} jobs and runs VideoGenerator
+    renders side by side. Each worker's ffmpeg gets cpu_count // workers threads so the
+    batch saturates the runner without oversubscribing it.
+    """
+
+    def __init__(self, max_workers: int = None, temp_dir: str = None):
+        self.cpu_count = os.cpu_count() or 1
+        env_workers = os.getenv("RENDER_WORKERS")
+        self.max_workers = max_workers or (int(env_workers) if env_workers else max(1, self.cpu_count // 2))
+        self.temp_dir = temp_dir
+        self.last_summary = {}
+
+    def plan(self, job_count: int) -> tuple:
+        """(workers, ffmpeg threads per job) for a batch of job_count renders."""
+        workers = max(1, min(self.max_workers, job_count))
+        return workers, max(1, self.cpu_count // workers)
+
+    def run(self, jobs: list):
+        """
+        Yields one result dict per job as renders finish (completion order, not submission
+        order). 'index' points back into jobs. A summary with videos/hour is left in
+        self.last_summary once the generator is exhausted.
+        """
+        if not jobs:
+            self.last_summary = {'videos': 0, 'failed': 0, 'wall_seconds': 0.0, 'videos_per_hour': 0.0}
+            return
+
+        workers, threads = self.plan(len(jobs))
+        log.info(f"🎬 Rendering {len(jobs)} videos with {workers} workers × {threads} ffmpeg threads")
+        start = time.perf_counter()
+        done = failed = 0
+        cpu_seconds = 0.0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(MP_START_METHOD)) as pool:
+            futures = [
+                pool.submit(_render_job, i, job['product'], job['script'], job.get('voice_path'), threads, self.temp_dir)
+                for i, job in enumerate(jobs)
+            ]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker process crashed (e.g. OOM-killed) before returning a result
+                    idx = futures.index(future)
+                    result = {'index': idx, 'asin': jobs[idx]['product'].get('asin'),
+                              'video_path': None, 'error': str(e), 'seconds': 0.0, 'encode': {}, 'artifacts': {}}
+                cpu_seconds += result['encode'].get('cpu_seconds', 0.0)
+                if result['video_path']:
+                    done += 1
+                    enc = result['encode']
+                    log.info(f"✅ Render {result['asin']} finished in {result['seconds']}s "
+                             f"(encode {enc.get('encode_fps')} fps, {enc.get('speed')}x, {enc.get('bitrate_kbps')} kbps)")
+                else:
+                    failed += 1
+                    log.error(f"❌ Render {result['asin']} failed: {result['error']}")
+                yield result
+
+        wall = time.perf_counter() - start
+        self.last_summary = {
+            'videos': done,
+            'failed': failed,
+            'workers': workers,
+            'threads_per_job': threads,
+            'wall_seconds': round(wall, 2),
+            'encode_cpu_seconds': round(cpu_seconds, 1),
+            'videos_per_hour': round(done / wall * 3600, 1) if wall > 0 else 0.0,
+        }
+        log.info(f"📊 Render batch: {done} videos in {wall:.1f}s ({self.last_summary['videos_per_hour']} videos/hour)")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Run Catalog - the product catalog held in memory for one pipeline run.
+
+Loaded from the CatalogStore once, with ASIN and category indexes, so the pipeline helpers
+(existing/recent ASINs, category balance, processed history, website sync) stop re-reading
+and re-serializing the whole catalog on every call. Mutations are written through to the
+SQLite store immediately; the JSON exports are only regenerated by flush(), for the
+collections marked dirty since the last flush.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from catalog_store import get_catalog, SITE, HISTORY
+
+log = logging.getLogger("RunCatalog")
+
+
+class RunCatalog:
+    def __init__(self, store=None):
+        self.store = store or get_catalog()
+        self._lock = threading.RLock()
+        # kind -> {asin: product} in catalog order, and kind -> {category: {asin}}
+        self._items = {}
+        self._by_category = {}
+        self._dirty = set()
+        for kind in (SITE, HISTORY):
+            self._load(kind, self.store.products(kind))
+        log.info(f"📚 Catalog loaded: {len(self._items[SITE])} website products, "
+                 f"{len(self._items[HISTORY])} in processed history")
+
+    def _load(self, kind: str, products: list):
+        items, by_category = {}, {}
+        for p in products:
+            if isinstance(p, dict) and p.get('asin'):
+                if p['asin'] in items:
+                    by_category.get(items[p['asin']].get('category'), set()).discard(p['asin'])
+                items[p['asin']] = p
+                by_category.setdefault(p.get('category'), set()).add(p['asin'])
+        self._items[kind] = items
+        self._by_category[kind] = by_category
+
+    def _index(self, kind: str, product: dict):
+        asin = product['asin']
+        old = self._items[kind].get(asin)
+        if old is not None:
+            self._by_category[kind].get(old.get('category'), set()).discard(asin)
+        self._items[kind][asin] = product
+        self._by_category[kind].setdefault(product.get('category'), set()).add(asin)
+
+    # ─── READS ───────────────────────────────────────────────────────
+
+    def products(self, kind: str) -> list:
+        """Copies of a collection's products in catalog order."""
+        with self._lock:
+            return [dict(p) for p in self._items[kind].values()]
+
+    def get(self, kind: str, asin: str) -> dict:
+        with self._lock:
+            product = self._items[kind].get(asin)
+            return dict(product) if product else None
+
+    def count(self, kind: str) -> int:
+        return len(self._items[kind])
+
+    def all_asins(self) -> set:
+        """Every ASIN on the website or in the processed history."""
+        with self._lock:
+            return set(self._items[SITE]) | set(self._items[HISTORY])
+
+    def recent_asins(self, days: int = 7) -> list:
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            return [asin for asin, p in self._items[HISTORY].items()
+                    if isinstance(p.get('processed_at'), str) and p['processed_at'] >= cutoff]
+
+    def category_counts(self, kind: str = SITE) -> dict:
+        with self._lock:
+            return {cat: len(asins) for cat, asins in self._by_category[kind].items() if asins}
+
+    # ─── MUTATIONS (written through to the store) ───────────────────
+
+    def upsert(self, kind: str, product: dict) -> bool:
+        if not product.get('asin'):
+            return False
+        with self._lock:
+            self.store.upsert(kind, product)
+            self._index(kind, dict(product))
+            self._dirty.add(kind)
+        return True
+
+    def add_if_missing(self, kind: str, product: dict) -> bool:
+        """Appends product unless its ASIN is already in the collection. True if added."""
+        with self._lock:
+            if not product.get('asin') or product['asin'] in self._items[kind]:
+                return False
+            return self.upsert(kind, product)
+
+    def patch(self, kind: str, asin: str, **fields) -> bool:
+        with self._lock:
+            product = self._items[kind].get(asin)
+            if product is None:
+                return False
+            return self.upsert(kind, {**product, **fields})
+
+    def replace(self, kind: str, products: list):
+        with self._lock:
+            self.store.replace(kind, products)
+            self._load(kind, [dict(p) for p in products if isinstance(p, dict)])
+            self._dirty.add(kind)
+
+    def trim(self, kind: str, keep: int):
+        """Drops all but the `keep` most recently added products of a collection."""
+        with self._lock:
+            items = self._items[kind]
+            if len(items) <= keep:
+                return
+            self.store.trim(kind, keep)
+            self._load(kind, list(items.values())[-keep:])
+            self._dirty.add(kind)
+
+    # ─── WRITE-THROUGH OF THE JSON EXPORTS ──────────────────────────
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def flush(self):
+        """Regenerates the JSON exports of every collection changed since the last flush."""
+        with self._lock:
+            dirty, self._dirty = sorted(self._dirty), set()
+            for kind in dirty:
+                try:
+                    self.store.export(kind)
+                except Exception as e:
+                    self._dirty.add(kind)
+                    log.warning(f"⚠️ Could not export {kind} catalog: {e}")
+        if dirty:
+            log.info(f"💾 Catalog exports written: {', '.join(dirty)}")
+
+
+_run_catalog = None
+_run_catalog_lock = threading.Lock()
+
+
+def get_run_catalog() -> RunCatalog:
+    """The catalog of the current run, loaded on first use and shared by every helper."""
+    global _run_catalog
+    with _run_catalog_lock:
+        if _run_catalog is None:
+            _run_catalog = RunCatalog()
+        return _run_catalog
+
+
+def flush_run_catalog():
+    """Writes pending exports at the end of a run (no-op if the catalog was never loaded)."""
+    with _run_catalog_lock:
+        catalog = _run_catalog
+    if catalog is not None and catalog.dirty:
+        catalog.flush()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Run Workspace - isolated scratch directory per pipeline run. Artifacts are tracked per
+product and stage, intermediates are dropped once a product is published, and the whole
+workspace (old runs + rendered videos) is kept under a disk quota, oldest files first.
+"""
+import os
+import shutil
+import logging
+from pathlib import Path
+from datetime import datetime
+
+log = logging.getLogger("RunWorkspace")
+
+DEFAULT_ROOT = Path(os.getenv("WORKSPACE_DIR", "workspace"))
+DEFAULT_QUOTA_BYTES = int(os.getenv("WORKSPACE_QUOTA_MB", "2048")) * 1024 * 1024
+DEFAULT_OUTPUT_DIR = Path("output_videos")
+
+# Stages whose files are scratch: removed by release() once the product is published
+INTERMEDIATE_STAGES = ('voice', 'render')
+
+
+def _dir_bytes(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+class RunWorkspace:
+    def __init__(self, root: Path = DEFAULT_ROOT, run_id: str = None,
+                 quota_bytes: int = DEFAULT_QUOTA_BYTES, output_dir: Path = DEFAULT_OUTPUT_DIR):
+        self.root = Path(root)
+        self.run_id = run_id or f"{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.run_dir = self.root / "runs" / self.run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.quota_bytes = quota_bytes
+        # {asin: {stage: [Path, ...]}}
+        self.artifacts = {}
+        self.freed_bytes = 0
+        self.evicted_bytes = 0
+
+    def stage_dir(self, stage: str) -> Path:
+        """Scratch directory for one stage of this run (created on demand)."""
+        path = self.run_dir / stage
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def track(self, asin: str, stage: str, *paths):
+        """Records files produced for asin at stage."""
+        bucket = self.artifacts.setdefault(asin, {}).setdefault(stage, [])
+        for p in paths:
+            if p:
+                bucket.append(Path(p))
+
+    @staticmethod
+    def _with_sidecars(path: Path) -> list:
+        # {asin}_voice.wav also owns {asin}_voice.wav.meta.json and {asin}_voice.chunks.json
+        if not path.parent.exists():
+            return []
+        return [p for p in path.parent.glob(f"{path.stem}.*") if p.is_file()]
+
+    def release(self, asin: str, stages: tuple = INTERMEDIATE_STAGES) -> int:
+        """Deletes the tracked intermediates of a published product. Returns bytes freed."""
+        freed = 0
+        for stage in stages:
+            for path in self.artifacts.get(asin, {}).pop(stage, []):
+                for f in self._with_sidecars(path):
+                    try:
+                        size = f.stat().st_size
+                        f.unlink()
+                        freed += size
+                    except OSError as e:
+                        log.warning(f"⚠️ Could not remove {f}: {e}")
+        self.freed_bytes += freed
+        return freed
+
+    def _protected(self) -> set:
+        keep = set()
+        for stages in self.artifacts.values():
+            for paths in stages.values():
+                for p in paths:
+                    keep.add(p.resolve())
+        return keep
+
+    def enforce_quota(self) -> int:
+        """
+        Evicts the oldest files from previous runs and output_dir until the workspace fits
+        the quota. Files of the current run and everything tracked by it are never touched.
+        Returns bytes evicted.
+        """
+        runs_dir = self.root / "runs"
+        candidates = []
+        total = 0
+        for base in (runs_dir, self.output_dir):
+            if not base.exists():
+                continue
+            for f in base.rglob('*'):
+                if not f.is_file():
+                    continue
+                st = f.stat()
+                total += st.st_size
+                if self.run_dir not in f.parents:
+                    candidates.append((st.st_mtime, st.st_size, f))
+        if total <= self.quota_bytes:
+            return 0
+
+        protected = self._protected()
+        evicted = 0
+        for _, size, f in sorted(candidates, key=lambda c: c[0]):
+            if total <= self.quota_bytes:
+                break
+            if f.resolve() in protected:
+                continue
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += size
+
+        # Drop run directories that are now empty
+        if runs_dir.exists():
+            for d in runs_dir.iterdir():
+                if d != self.run_dir and d.is_dir() and not any(p.is_file() for p in d.rglob('*')):
+                    shutil.rmtree(d, ignore_errors=True)
+
+        self.evicted_bytes += evicted
+        if evicted:
+            log.info(f"🧹 Workspace quota: evicted {evicted / 1024 / 1024:.1f} MB of old artifacts")
+        return evicted
+
+    def usage(self) -> dict:
+        """Disk usage of this run (per stage) and of the whole workspace."""
+        by_stage = {}
+        if self.run_dir.exists():
+            for d in self.run_dir.iterdir():
+                if d.is_dir():
+                    by_stage[d.name] = _dir_bytes(d)
+        videos = 0
+        for stages in self.artifacts.values():
+            for p in stages.get('video', []):
+                if p.exists():
+                    videos += p.stat().st_size
+        by_stage['video'] = videos
+        return {
+            'run_id': self.run_id,
+            'run_bytes': sum(by_stage.values()),
+            'by_stage': by_stage,
+            'workspace_bytes': _dir_bytes(self.root / "runs") + _dir_bytes(self.output_dir),
+            'quota_bytes': self.quota_bytes,
+            'freed_bytes': self.freed_bytes,
+            'evicted_bytes': self.evicted_bytes,
+        }
+
+    def close(self) -> dict:
+        """Final quota pass; removes the run directory if nothing is left in it."""
+        self.enforce_quota()
+        report = self.usage()
+        if not any(p.is_file() for p in self.run_dir.rglob('*')):
+            shutil.rmtree(self.run_dir, ignore_errors=True)
+        mb = lambda b: f"{b / 1024 / 1024:.1f} MB"
+        stages = ", ".join(f"{k} {mb(v)}" for k, v in sorted(report['by_stage'].items()))
+        log.info(f"💾 Run {self.run_id}: {mb(report['run_bytes'])} ({stages}); freed {mb(report['freed_bytes'])}, "
+                 f"workspace {mb(report['workspace_bytes'])} / {mb(self.quota_bytes)}")
+        return report
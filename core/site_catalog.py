@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Site Catalog Export - writes the slim, cacheable copy of the catalog the website loads.
+
+Only the fields the pages render are kept. Products are sharded per category into
+minified JSON files named by content hash (amazing/data/catalog/<slug>.<hash>.json),
+each with .gz and .br siblings, and listed in amazing/data/catalog-manifest.json. Shards
+never change once written, so they are served as immutable (see amazing/_headers); only
+the small manifest is revalidated. Pages load it through amazing/assets/catalog.js.
+"""
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+log = logging.getLogger("SiteCatalog")
+
+SITE_DATA_DIR = Path(__file__).resolve().parent.parent / "amazing" / "data"
+SHARD_DIR_NAME = "catalog"
+MANIFEST_NAME = "catalog-manifest.json"
+
+# Fields used by the product cards, category pages and search
+SITE_FIELDS = ('asin', 'title', 'price', 'rating', 'category', 'image_url', 'images',
+               'affiliate_url', 'processed_at', 'youtube_url')
+
+# Catalog category -> site section (tech.html / lifestyle.html / home.html). Published in
+# the manifest, where assets/catalog.js merges it into the pages' CATEGORY_SECTIONS.
+SECTIONS = {
+    'Tech': 'Tech', 'Gaming': 'Tech', 'Tech Gadgets': 'Tech', 'Electronics': 'Tech',
+    'Lifestyle': 'Lifestyle', 'Life & Style': 'Lifestyle', 'Lifestyle Accessories': 'Lifestyle',
+    'Beauty': 'Lifestyle', 'Luxury Beauty': 'Lifestyle', 'Digital Music/Handmade/Videos': 'Lifestyle',
+    'Home': 'Home', 'Home Essentials': 'Home', 'Home & Auto': 'Home', 'Automotive Gear': 'Home', 'Auto': 'Home',
+}
+HASH_LEN = 12
+
+
+def slim(product: dict) -> dict:
+    return {k: product[k] for k in SITE_FIELDS if product.get(k) not in (None, '', [])}
+
+
+def slugify(category: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', (category or 'other').lower()).strip('-') or 'other'
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_shard(shard_dir: Path, name: str, body: bytes) -> dict:
+    """Writes a shard and its precompressed variants (skipped if this content already exists)."""
+    path = shard_dir / name
+    info = {'file': f"{SHARD_DIR_NAME}/{name}", 'bytes': len(body)}
+    if not path.exists():
+        _write_atomic(path, body)
+        # mtime=0 keeps the .gz byte-identical across runs
+        _write_atomic(path.with_name(name + '.gz'), gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(path.with_name(name + '.br'), brotli.compress(body, quality=11))
+    gz = path.with_name(name + '.gz')
+    br = path.with_name(name + '.br')
+    if gz.exists():
+        info['gzip_bytes'] = gz.stat().st_size
+    if br.exists():
+        info['br_bytes'] = br.stat().st_size
+    return info
+
+
+def export_site_catalog(products: list, site_dir: Path = SITE_DATA_DIR) -> dict:
+    """Writes the shards and manifest for `products` (catalog order). Returns the manifest."""
+    site_dir = Path(site_dir)
+    shard_dir = site_dir / SHARD_DIR_NAME
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = site_dir / MANIFEST_NAME
+
+    by_category = {}
+    for p in products:
+        if isinstance(p, dict) and p.get('asin'):
+            by_category.setdefault(p.get('category') or 'Other', []).append(slim(p))
+
+    shards = {}
+    for category, items in sorted(by_category.items()):
+        body = json.dumps(items, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:HASH_LEN]
+        info = _write_shard(shard_dir, f"{slugify(category)}.{digest}.json", body)
+        info.update({'section': SECTIONS.get(category, 'Other'), 'count': len(items)})
+        shards[category] = info
+
+    # Keep the previous generation's shards so pages holding the old manifest still load
+    keep = {Path(s['file']).name for s in shards.values()}
+    try:
+        with open(manifest_path, 'r') as f:
+            keep |= {Path(s['file']).name for s in json.load(f).get('shards', {}).values()}
+    except Exception:
+        pass
+    for f in shard_dir.iterdir():
+        base = f.name[:-3] if f.name.endswith(('.gz', '.br')) else f.name
+        if base not in keep:
+            f.unlink()
+
+    manifest = {
+        'version': 1,
+        'generated_at': int(time.time()),
+        'count': sum(s['count'] for s in shards.values()),
+        'sections': SECTIONS,
+        'shards': shards,
+    }
+    _write_atomic(manifest_path, json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    total = sum(s['bytes'] for s in shards.values())
+    compressed = sum(s.get('br_bytes', s.get('gzip_bytes', s['bytes'])) for s in shards.values())
+    log.info(f"📦 Site catalog: {manifest['count']} products in {len(shards)} shards, "
+             f"{total / 1024:.0f} KB minified / {compressed / 1024:.0f} KB compressed")
+    return manifest
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Status Poller - watches remote processing jobs (Meta media containers, TikTok publishes...)
+from one background thread. Each job is checked on an adaptive schedule that starts short
+and backs off, until it reaches a final state or its deadline passes.
+"""
+import time
+import heapq
+import logging
+import itertools
+import threading
+from concurrent.futures import Future
+
+log = logging.getLogger("StatusPoller")
+
+DEFAULT_INITIAL = 2.0
+DEFAULT_FACTOR = 1.6
+DEFAULT_MAX_INTERVAL = 20.0
+DEFAULT_DEADLINE = 300.0
+
+
+class StatusPoller:
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._cv = threading.Condition()
+        self._thread = None
+
+    def watch(self, check, done=lambda s: s == 'FINISHED', failed=lambda s: s in ('ERROR', 'EXPIRED'),
+              label: str = "job", initial: float = DEFAULT_INITIAL, factor: float = DEFAULT_FACTOR,
+              max_interval: float = DEFAULT_MAX_INTERVAL, deadline: float = DEFAULT_DEADLINE) -> Future:
+        """
+        Polls check() -> state until done(state). Returns a Future that resolves to the final
+        state, or fails with RuntimeError (failed state) / TimeoutError (deadline). Errors
+        raised by check() are treated as transient and retried on the same schedule.
+        """
+        future = Future()
+        now = time.monotonic()
+        job = {
+            'check': check, 'done': done, 'failed': failed, 'label': label, 'future': future,
+            'interval': initial, 'factor': factor, 'max_interval': max_interval,
+            'started': now, 'deadline': now + deadline, 'polls': 0, 'state': None,
+        }
+        self._schedule(now + initial, job)
+        return future
+
+    def _schedule(self, when: float, job: dict):
+        with self._cv:
+            heapq.heappush(self._heap, (when, next(self._counter), job))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="status-poller", daemon=True)
+                self._thread.start()
+            self._cv.notify()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while True:
+                    if not self._heap:
+                        self._thread = None
+                        return
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cv.wait(timeout=wait)
+                _, _, job = heapq.heappop(self._heap)
+            self._poll(job)
+
+    def _poll(self, job: dict):
+        job['polls'] += 1
+        try:
+            state = job['check']()
+            job['state'] = state
+            if job['done'](state):
+                elapsed = time.monotonic() - job['started']
+                log.info(f"✅ {job['label']}: {state} after {elapsed:.1f}s ({job['polls']} polls)")
+                job['future'].set_result(state)
+                return
+            if job['failed'](state):
+                job['future'].set_exception(RuntimeError(f"{job['label']} ended in state {state}"))
+                return
+        except Exception as e:
+            log.warning(f"⚠️ {job['label']}: status check failed ({e}), will retry")
+
+        now = time.monotonic()
+        if now >= job['deadline']:
+            job['future'].set_exception(TimeoutError(
+                f"{job['label']} still {job['state']} after {now - job['started']:.0f}s"))
+            return
+        log.info(f"   {job['label']}: {job['state']}, next check in {job['interval']:.1f}s")
+        when = min(now + job['interval'], job['deadline'])
+        job['interval'] = min(job['interval'] * job['factor'], job['max_interval'])
+        self._schedule(when, job)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller() -> StatusPoller:
+    """Process-wide poller shared by all uploaders."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = StatusPoller()
+        return _poller
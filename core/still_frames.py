@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Still Frames - decode each product image once, letterbox it to the video canvas and cache it,
+so ffmpeg only has to loop ready-made frames instead of scaling every frame.
+"""
+import os
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional: VideoGenerator falls back to ffmpeg scaling
+    Image = None
+
+log = logging.getLogger("StillFrames")
+
+STILLS_VERSION = 1
+DEFAULT_STILLS_DIR = Path(os.getenv("STILLS_CACHE_DIR", "cache/stills"))
+DEFAULT_MAX_BYTES = int(os.getenv("STILLS_CACHE_MAX_MB", "300")) * 1024 * 1024
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def _still_key(src: Path, size: tuple) -> str:
+    h = hashlib.sha1(f"v{STILLS_VERSION}:{size[0]}x{size[1]}:".encode())
+    with open(src, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def prepare_still(src, size=(1080, 1920), cache_dir: Path = DEFAULT_STILLS_DIR) -> Path:
+    """
+    Returns a cached size[0]×size[1] JPEG of src, scaled to fit and padded with black
+    (same result as ffmpeg's scale=...:force_original_aspect_ratio=decrease,pad=...).
+    JPEG sources use draft mode so only the needed DCT scale is decoded.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed")
+    src = Path(src)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    dest = cache_dir / f"{_still_key(src, size)}.jpg"
+    if dest.exists() and dest.stat().st_size > 0:
+        # mtime doubles as last-use time for LRU eviction
+        os.utime(dest)
+        return dest
+
+    width, height = size
+    with Image.open(src) as img:
+        # draft() lets libjpeg decode at 1/2, 1/4 or 1/8 scale when the source is larger
+        img.draft('RGB', (width, height))
+        img = ImageOps.exif_transpose(img)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        scale = min(width / img.width, height / img.height)
+        fitted = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        if fitted != img.size:
+            img = img.resize(fitted, Image.LANCZOS)
+        canvas = Image.new('RGB', (width, height), (0, 0, 0))
+        canvas.paste(img, ((width - fitted[0]) // 2, (height - fitted[1]) // 2))
+
+    # Unique per call: parallel render processes may prepare the same image at once
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=dest.name + ".", suffix=".part")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            canvas.save(f, 'JPEG', quality=95, subsampling=0)
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return dest
+
+
+def evict(cache_dir: Path = DEFAULT_STILLS_DIR, max_bytes: int = DEFAULT_MAX_BYTES, keep=()) -> int:
+    """Deletes least-recently-used stills until the cache fits max_bytes. Returns bytes freed."""
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return 0
+    entries = []
+    for f in cache_dir.glob('*.jpg'):
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, f))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+    keep = {Path(p) for p in keep}
+    freed = 0
+    for _, size, f in sorted(entries):
+        if total <= max_bytes:
+            break
+        if f in keep:
+            continue
+        try:
+            f.unlink()
+        except OSError:
+            continue
+        total -= size
+        freed += size
+    if freed:
+        log.info(f"🧹 Stills cache: evicted {freed / 1024 / 1024:.1f} MB")
+    return freed
+
+
+def prepare_stills(paths: list, size=(1080, 1920), cache_dir: Path = DEFAULT_STILLS_DIR,
+                   max_bytes: int = DEFAULT_MAX_BYTES):
+    """Prepares all images; returns the list of still paths or None if any image fails."""
+    stills = []
+    for path in paths:
+        try:
+            stills.append(prepare_still(path, size, cache_dir))
+        except Exception as e:
+            log.warning(f"⚠️ Could not prepare still for {path}: {e}")
+            return None
+    evict(cache_dir, max_bytes, keep=stills)
+    return stills
@@ -3,18 +3,18 @@
 Strategy Monitor - Strategic product discovery and profit optimization
 """
 import os
-import json
 import logging
-from pathlib import Path
 from datetime import datetime
 import random
 
+from catalog_store import get_catalog
+
 log = logging.getLogger("StrategyMonitor")
 
 class StrategyMonitor:
-    def __init__(self, data_dir: Path):
-        self.data_dir = data_dir
-        self.products_file = data_dir / "products.json"
+    def __init__(self, catalog=None):
+        # Any object with category_counts(); defaults to the shared catalog store
+        self.catalog = catalog
         # Commission rates by category
         self.commissions = {
             "Tech": 0.04,
@@ -33,16 +33,13 @@ class StrategyMonitor:
         counts = {"Tech": 0, "Life & Style": 0, "Home & Auto": 0}
         
         # Load current product counts
-        if self.products_file.exists():
-            try:
-                with open(self.products_file, 'r') as f:
-                    products = json.load(f)
-                    for p in products:
-                        cat = p.get('category')
-                        if cat in counts:
-                            counts[cat] += 1
-            except Exception as e:
-                log.warning(f"Error counting products for balance: {e}")
+        try:
+            catalog = self.catalog or get_catalog()
+            for cat, n in catalog.category_counts().items():
+                if cat in counts:
+                    counts[cat] = n
+        except Exception as e:
+            log.warning(f"Error counting products for balance: {e}")
 
         # Define high-intent, targeted keywords for realistic Amazon searches
         lifestyle_keywords = ["luxury skincare set", "designer sunglasses polarized", "aromatherapy diffuser kit", "premium yoga mat eco-friendly", "silk pillowcase set luxury"]
@@ -85,6 +82,6 @@ class StrategyMonitor:
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    monitor = StrategyMonitor(Path("./data"))
+    monitor = StrategyMonitor()
     print("Strategic Targets:", monitor.get_discovery_priority())
     print("Profit Test (Lifestyle, $50):", monitor.calculate_potential_profit("$50", "Lifestyle"))
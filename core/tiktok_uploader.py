@@ -1,22 +1,92 @@
 #!/usr/bin/env python3
 import os
 import json
+import time
 import logging
 import requests
 from pathlib import Path
+from public_media import get_public_media
 
 log = logging.getLogger("TikTokUploader")
 
+# Content Posting API limits: chunks of 5-64 MB, the last one may grow up to 128 MB,
+# and files under 5 MB must be sent as a single chunk.
+MIN_CHUNK = 5 * 1024 * 1024
+MAX_CHUNK = 64 * 1024 * 1024
+CHUNK_SIZE = min(MAX_CHUNK, max(MIN_CHUNK, int(os.getenv("TIKTOK_CHUNK_MB", "10")) * 1024 * 1024))
+CHUNK_RETRIES = 5
+# Upload URLs expire an hour after init
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+SESSIONS_FILE = Path(os.getenv("TIKTOK_UPLOAD_SESSIONS_FILE", DATA_DIR / "tiktok_upload_sessions.json"))
+SESSION_MAX_AGE = 55 * 60
+
+
+def plan_chunks(video_size: int, chunk_size: int = CHUNK_SIZE) -> tuple:
+    """(chunk_size, total_chunk_count) as the API expects; the remainder rides on the last chunk."""
+    if video_size < MIN_CHUNK or video_size <= chunk_size:
+        return video_size, 1
+    return chunk_size, video_size // chunk_size
+
+
+class _FileSlice:
+    """Read-only window [offset, offset+length) of an open file, streamed by requests."""
+
+    def __init__(self, f, offset: int, length: int):
+        self.f = f
+        self.remaining = length
+        f.seek(offset)
+
+    def __len__(self):
+        return self.remaining
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def _load_sessions() -> dict:
+    if SESSIONS_FILE.exists():
+        try:
+            with open(SESSIONS_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def _save_sessions(sessions: dict):
+    try:
+        SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        live = {k: v for k, v in sessions.items() if now - v.get('created_at', 0) < SESSION_MAX_AGE}
+        tmp = SESSIONS_FILE.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(live, f, indent=2)
+        os.replace(tmp, SESSIONS_FILE)
+    except OSError as e:
+        log.warning(f"⚠️ Could not persist TikTok upload session: {e}")
+
 class TikTokUploader:
     def __init__(self, token_file="tiktok_tokens.json"):
         self.client_key = os.getenv("TIKTOK_CLIENT_KEY")
         self.client_secret = os.getenv("TIKTOK_CLIENT_SECRET")
         self.token_file = Path(token_file)
         self.access_token = self._load_tokens()
+        # PULL_FROM_URL needs the media host's domain verified in the TikTok developer portal
+        self.pull_from_url = os.getenv("TIKTOK_PULL_FROM_URL", "").lower() in ("1", "true", "yes")
+        self.last_upload_metrics = {}
         
         if not self.client_key or not self.client_secret:
             log.warning("TikTok credentials missing in .env")
 
+    def is_configured(self) -> bool:
+        """True if an access token is available for uploads"""
+        return bool(self.access_token)
+
     def _load_tokens(self):
         # 1. Try loading from Environment Variable (CI)
         token_b64 = os.getenv("TIKTOK_TOKEN_BASE64")
@@ -44,12 +114,22 @@ class TikTokUploader:
             return None
 
         try:
+            video_size = os.path.getsize(video_path)
+            st = os.stat(video_path)
+            session_key = f"{os.path.abspath(video_path)}:{video_size}:{int(st.st_mtime)}"
+            sessions = _load_sessions()
+            session = sessions.get(session_key)
+            if session and time.time() - session['created_at'] < SESSION_MAX_AGE and not self.pull_from_url:
+                log.info(f"🔁 Resuming TikTok upload at chunk {session['next_chunk'] + 1}/{session['total_chunks']}")
+                return self._upload_chunks(video_path, session, sessions, session_key, title)
+
             # 1. Initialize upload (Direct Post)
             url = "https://open.tiktokapis.com/v2/post/publish/video/init/"
             headers = {
                 'Authorization': f'Bearer {self.access_token}',
                 'Content-Type': 'application/json; charset=UTF-8'
             }
+            chunk_size, total_chunks = plan_chunks(video_size)
             body = {
                 "post_info": {
                     "title": title,
@@ -61,37 +141,110 @@ class TikTokUploader:
                 },
                 "source_info": {
                     "source": "FILE_UPLOAD",
-                    "video_size": os.path.getsize(video_path),
-                    "chunk_size": os.path.getsize(video_path),
-                    "total_chunk_count": 1
+                    "video_size": video_size,
+                    "chunk_size": chunk_size,
+                    "total_chunk_count": total_chunks
                 }
             }
             
+            public_url = get_public_media().url_for(video_path) if self.pull_from_url else None
+            if public_url:
+                # TikTok fetches the shared public copy itself; nothing to PUT
+                body["source_info"] = {"source": "PULL_FROM_URL", "video_url": public_url}
+            
             res = requests.post(url, headers=headers, json=body).json()
-            if 'error' in res:
+            error = res.get('error')
+            if error and not (isinstance(error, dict) and error.get('code') == 'ok'):
                 log.error(f"TikTok Init failed: {res}")
                 return None
+            
+            if public_url:
+                log.info(f"✅ TikTok pulling video from URL: {title}")
+                return res.get('data', {}).get('publish_id') or "SUCCESS"
                 
             upload_url = res.get('data', {}).get('upload_url')
             if not upload_url:
                 log.error(f"TikTok No upload URL: {res}")
                 return None
 
-            # 2. Upload the file
-            with open(video_path, 'rb') as f:
-                headers = {'Content-Type': 'video/mp4'}
-                res = requests.put(upload_url, data=f, headers=headers)
-                if res.status_code != 200:
-                    log.error(f"TikTok Upload failed ({res.status_code}): {res.text}")
-                    return None
-
-            log.info(f"✅ Video uploaded to TikTok: {title}")
-            return "SUCCESS" # TikTok V2 doesn't always return a public URL immediately
+            # 2. Upload the file chunk by chunk
+            session = {
+                'upload_url': upload_url,
+                'publish_id': res.get('data', {}).get('publish_id'),
+                'chunk_size': chunk_size,
+                'total_chunks': total_chunks,
+                'next_chunk': 0,
+                'created_at': time.time(),
+            }
+            sessions[session_key] = session
+            _save_sessions(sessions)
+            return self._upload_chunks(video_path, session, sessions, session_key, title)
             
         except Exception as e:
             log.error(f"TikTok Error: {e}")
             return None
 
+    def _upload_chunks(self, video_path: str, session: dict, sessions: dict, session_key: str, title: str):
+        """
+        PUTs the remaining chunks with Content-Range, each streamed from its file offset.
+        Failed chunks are retried with backoff; progress is persisted after every chunk so a
+        later call resumes where this one stopped (while the upload URL is still valid).
+        """
+        video_size = os.path.getsize(video_path)
+        chunk_size, total = session['chunk_size'], session['total_chunks']
+        start = time.time()
+        sent = 0
+        with requests.Session() as http, open(video_path, 'rb') as f:
+            for index in range(session['next_chunk'], total):
+                first = index * chunk_size
+                last = video_size - 1 if index == total - 1 else first + chunk_size - 1
+                length = last - first + 1
+                headers = {
+                    'Content-Type': 'video/mp4',
+                    'Content-Length': str(length),
+                    'Content-Range': f"bytes {first}-{last}/{video_size}",
+                }
+                for attempt in range(CHUNK_RETRIES):
+                    t0 = time.time()
+                    try:
+                        res = http.put(session['upload_url'], data=_FileSlice(f, first, length), headers=headers, timeout=120)
+                        if res.status_code in (200, 201, 206):
+                            break
+                        error = f"HTTP {res.status_code}: {res.text[:200]}"
+                        if res.status_code < 500 and res.status_code != 429:
+                            log.error(f"TikTok chunk {index + 1}/{total} rejected ({error})")
+                            sessions.pop(session_key, None)
+                            _save_sessions(sessions)
+                            return None
+                    except requests.RequestException as e:
+                        error = str(e)
+                    wait = 2 ** attempt
+                    log.warning(f"⚠️ TikTok chunk {index + 1}/{total} failed ({error}), retry in {wait}s")
+                    time.sleep(wait)
+                else:
+                    log.error(f"❌ TikTok upload stopped at chunk {index + 1}/{total}; will resume from here")
+                    return None
+
+                elapsed = max(time.time() - t0, 0.001)
+                sent += length
+                session['next_chunk'] = index + 1
+                _save_sessions(sessions)
+                log.info(f"⏫ TikTok chunk {index + 1}/{total}: {length / 1024 / 1024:.1f} MB "
+                         f"at {length / 1024 / 1024 / elapsed:.2f} MB/s")
+
+        sessions.pop(session_key, None)
+        _save_sessions(sessions)
+        elapsed = max(time.time() - start, 0.001)
+        self.last_upload_metrics = {
+            'bytes': sent,
+            'chunks': total,
+            'seconds': round(elapsed, 2),
+            'mb_per_sec': round(sent / 1024 / 1024 / elapsed, 2),
+        }
+        log.info(f"✅ Video uploaded to TikTok: {title} ({sent / 1024 / 1024:.1f} MB in {elapsed:.1f}s, "
+                 f"{self.last_upload_metrics['mb_per_sec']} MB/s)")
+        return session.get('publish_id') or "SUCCESS" # TikTok V2 doesn't always return a public URL immediately
+
 if __name__ == "__main__":
     import argparse
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+TTS Chunking - sentence splitting and crossfaded WAV assembly for parallel synthesis
+"""
+import re
+import wave
+import json
+import logging
+from array import array
+from pathlib import Path
+
+log = logging.getLogger("TTSChunking")
+
+# Split after ., ! or ? (optionally followed by a closing quote) when whitespace follows
+SENTENCE_RE = re.compile(r'(?<=[.!?])["\')\]]?\s+')
+
+
+def split_sentences(text: str, min_words: int = 4) -> list:
+    """
+    Splits narration at sentence boundaries. Very short fragments ("Wow!") are
+    merged into the following sentence so each request has enough context for prosody.
+    """
+    parts = [p.strip() for p in SENTENCE_RE.split(text.strip()) if p and p.strip()]
+    chunks = []
+    carry = ""
+    for part in parts:
+        part = f"{carry} {part}".strip() if carry else part
+        if len(part.split()) < min_words:
+            carry = part
+            continue
+        chunks.append(part)
+        carry = ""
+    if carry:
+        if chunks:
+            chunks[-1] = f"{chunks[-1]} {carry}"
+        else:
+            chunks.append(carry)
+    return chunks
+
+
+def crossfade_wavs(paths: list, output_path: Path, fade_ms: int = 40) -> list:
+    """
+    Joins WAV files into one track with a short linear crossfade between clips.
+    Returns per-clip (start, end) timestamps in seconds on the output timeline.
+    Non-16-bit audio is concatenated without crossfade.
+    """
+    clips = []
+    params = None
+    for path in paths:
+        with wave.open(str(path), 'rb') as w:
+            p = w.getparams()
+            if params and (p.nchannels, p.sampwidth, p.framerate) != (params.nchannels, params.sampwidth, params.framerate):
+                raise ValueError(f"Incompatible WAV format in {path}: {p}")
+            params = params or p
+            clips.append(w.readframes(w.getnframes()))
+
+    channels, width, rate = params.nchannels, params.sampwidth, params.framerate
+    frame_bytes = channels * width
+    fade_frames = int(rate * fade_ms / 1000) if width == 2 else 0
+
+    timestamps = []
+    out = array('h') if width == 2 else bytearray()
+    cursor = 0  # in frames
+    for i, raw in enumerate(clips):
+        n_frames = len(raw) // frame_bytes
+        raw = raw[:n_frames * frame_bytes]
+        overlap = min(fade_frames, n_frames // 2, cursor) if i > 0 else 0
+        start = cursor - overlap
+
+        if width == 2:
+            samples = array('h')
+            samples.frombytes(raw)
+            n = overlap * channels
+            base = len(out) - n
+            for k in range(n):
+                gain = (k // channels + 1) / (overlap + 1)
+                mixed = out[base + k] * (1.0 - gain) + samples[k] * gain
+                out[base + k] = max(-32768, min(32767, int(mixed)))
+            out.extend(samples[n:])
+        else:
+            out.extend(raw)
+
+        cursor = start + n_frames
+        timestamps.append((round(start / rate, 3), round(cursor / rate, 3)))
+
+    output_path = Path(output_path)
+    with wave.open(str(output_path), 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(out.tobytes() if width == 2 else bytes(out))
+    return timestamps
+
+
+def save_chunk_timestamps(voice_path: Path, chunks: list, timestamps: list) -> Path:
+    """Writes caption timing next to the voice file as {voice}.chunks.json."""
+    voice_path = Path(voice_path)
+    sidecar = voice_path.with_name(voice_path.stem + ".chunks.json")
+    data = [{"text": t, "start": s, "end": e} for t, (s, e) in zip(chunks, timestamps)]
+    with open(sidecar, 'w') as f:
+        json.dump(data, f, indent=2)
+    return sidecar
+
+
+def load_chunk_timestamps(voice_path: Path) -> list:
+    """Returns caption timing saved by save_chunk_timestamps, or [] if absent."""
+    voice_path = Path(voice_path)
+    sidecar = voice_path.with_name(voice_path.stem + ".chunks.json")
+    if not sidecar.exists():
+        return []
+    try:
+        with open(sidecar, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        log.warning(f"⚠️ Could not read chunk timestamps {sidecar}: {e}")
+        return []
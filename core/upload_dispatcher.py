@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Upload Dispatcher - starts every platform's upload for a finished video at once, with a
+concurrency limit per platform, and hands back each product once all its uploads are done
+"""
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+log = logging.getLogger("UploadDispatcher")
+
+# Concurrent uploads allowed per platform (override with UPLOAD_LIMIT_<PLATFORM>)
+DEFAULT_LIMITS = {'youtube': 1, 'facebook': 2, 'instagram': 2, 'tiktok': 1}
+
+
+def _limit(platform: str) -> int:
+    env = os.getenv(f"UPLOAD_LIMIT_{platform.upper()}")
+    return max(1, int(env)) if env else DEFAULT_LIMITS.get(platform, 1)
+
+
+class UploadDispatcher:
+    """
+    submit(key, {platform: fn}) runs each fn() on that platform's own thread pool, so a
+    slow Instagram poll never holds up YouTube or the next product. fn may also return a
+    Future (e.g. a container still processing); the upload then completes when it resolves,
+    without holding a pool thread. results() yields (key, {platform: result}) in completion
+    order; a result holds ok/value/error/seconds.
+    """
+
+    def __init__(self, limits: dict = None):
+        self.limits = limits or {}
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._done = queue.Queue()
+        self._pending = 0
+        self.durations = {}  # platform -> [seconds, ...]
+        self.publish_seconds = []
+
+    def _pool(self, platform: str) -> ThreadPoolExecutor:
+        with self._lock:
+            if platform not in self._pools:
+                workers = self.limits.get(platform) or _limit(platform)
+                self._pools[platform] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"upload-{platform}")
+            return self._pools[platform]
+
+    def submit(self, key, tasks: dict, label: str = None):
+        """Starts all uploads for one product. tasks maps platform -> zero-arg callable."""
+        label = label or str(key)
+        results = {}
+        remaining = [len(tasks)]
+        start = time.perf_counter()
+        self._pending += 1
+        if not tasks:
+            self._done.put((key, label, results, 0.0))
+            return
+
+        def run(platform, fn):
+            t0 = time.perf_counter()
+            try:
+                value = fn()
+            except Exception as e:
+                finish(platform, t0, None, e)
+                return
+            if isinstance(value, Future):
+                def resolved(f):
+                    error = f.exception()
+                    finish(platform, t0, None if error else f.result(), error)
+                value.add_done_callback(resolved)
+            else:
+                finish(platform, t0, value, None)
+
+        def finish(platform, t0, value, error):
+            result = {'ok': bool(value) and error is None, 'value': value, 'error': str(error) if error else None}
+            result['seconds'] = round(time.perf_counter() - t0, 2)
+            status = "✅" if result['ok'] else "❌"
+            log.info(f"{status} {platform} upload for {label}: {result['seconds']}s"
+                     + (f" ({result['error']})" if result['error'] else ""))
+            with self._lock:
+                results[platform] = result
+                self.durations.setdefault(platform, []).append(result['seconds'])
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self._done.put((key, label, results, round(time.perf_counter() - start, 2)))
+
+        for platform, fn in tasks.items():
+            self._pool(platform).submit(run, platform, fn)
+
+    def results(self):
+        """Yields (key, results) for every submitted product as its uploads complete."""
+        while self._pending:
+            key, label, results, wall = self._done.get()
+            self._pending -= 1
+            self.publish_seconds.append(wall)
+            slowest = max(results.items(), key=lambda kv: kv[1]['seconds'], default=(None, None))[0]
+            log.info(f"📤 Published {label} to {len(results)} platforms in {wall}s (slowest: {slowest})")
+            yield key, results
+
+    def summary(self) -> dict:
+        per_platform = {
+            p: {'uploads': len(d), 'avg_seconds': round(sum(d) / len(d), 2), 'max_seconds': max(d)}
+            for p, d in self.durations.items() if d
+        }
+        publish = self.publish_seconds
+        return {
+            'platforms': per_platform,
+            'products': len(publish),
+            'avg_publish_seconds': round(sum(publish) / len(publish), 2) if publish else 0.0,
+        }
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
@@ -2,10 +2,13 @@ import os
 import logging
 import requests
 from pathlib import Path
+from public_media import get_public_media
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("UploadPostUploader")
 
+PUBLISH_MEDIA = os.getenv("UPLOADPOST_PUBLISH_MEDIA", "").lower() in ("1", "true", "yes")
+
 class UploadPostUploader:
     def __init__(self, api_key, user="AmazingCoolFinds"):
         self.api_key = api_key
@@ -29,6 +32,13 @@ class UploadPostUploader:
         if platforms is None:
             platforms = ["youtube", "instagram", "facebook", "tiktok"]
         
+        # Reuse a public copy another uploader already made; never publish one just for this call
+        # unless UPLOADPOST_PUBLISH_MEDIA opts in (the file then goes to the public media host)
+        if not str(video_path).startswith("http"):
+            video_path = get_public_media().url_for(video_path, upload=PUBLISH_MEDIA) or str(video_path)
+        if video_path.startswith("http"):
+            return self.upload_from_url(video_path, title, description, platforms, affiliate_link)
+        
         headers = {
             "Authorization": f"Apikey {self.api_key}"
         }
@@ -44,22 +54,19 @@ class UploadPostUploader:
             "privacy_status": "public"
         }
         
-        if video_path.startswith("http"):
-            data["video"] = video_path
-        else:
-            try:
-                with open(video_path, "rb") as f:
-                    files = {"video": f}
-                    response = requests.post(
-                        f"{self.base_url}/api/upload",
-                        headers=headers,
-                        data=data,
-                        files=files,
-                        timeout=300
-                    )
-            except Exception as e:
-                log.error(f"❌ Failed to read video file: {e}")
-                return None
+        try:
+            with open(video_path, "rb") as f:
+                files = {"video": f}
+                response = requests.post(
+                    f"{self.base_url}/api/upload",
+                    headers=headers,
+                    data=data,
+                    files=files,
+                    timeout=300
+                )
+        except Exception as e:
+            log.error(f"❌ Failed to read video file: {e}")
+            return None
         
         try:
             result = response.json()
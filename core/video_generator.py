@@ -1,46 +1,143 @@
 #!/usr/bin/env python3
 import os
+import json
+import hashlib
 import logging
-import subprocess
-import requests
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from audio_metadata import probe_audio
+import still_frames
+from image_store import ImageStore
+from ffmpeg_runner import run_ffmpeg
 
 log = logging.getLogger("VideoGenerator")
 
+SCALE_PAD_FILTER = "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2,setsar=1"
+
+# Bump whenever the filter graph changes in a way that alters the rendered output
+RENDER_TEMPLATE_VERSION = 2
+# Frame rate of the looped slide inputs (both render paths) and of every encoded output
+FRAME_RATE = 30
+
+# Standardize output format for maximum compatibility (QuickTime/iPhone)
+# -ac 2 (Stereo)
+# -ar 44100 (44.1kHz)
+# -pix_fmt yuv420p (Required for broad H.264 support)
+VIDEO_ENCODER_ARGS = ["-c:v", "libx264", "-profile:v", "high", "-level:v", "4.0", "-pix_fmt", "yuv420p",
+                      "-r", str(FRAME_RATE),
+                      "-color_range", "1", "-colorspace", "bt709", "-color_trc", "bt709", "-color_primaries", "bt709"]
+AUDIO_ENCODER_ARGS = ["-c:a", "aac", "-ac", "2", "-ar", "44100"]
+
+# Named speed/quality presets. Slides are stills with short crossfades, so
+# tune=stillimage and a long GOP (keyframe every 2s at 30 fps) cost little quality.
+# Compare them with: python tools/render_benchmark.py --profiles
+RENDER_PROFILES = {
+    'draft': {'preset': 'ultrafast', 'crf': 30, 'tune': 'stillimage', 'gop': 60, 'audio_bitrate': '96k'},
+    'standard': {'preset': 'faster', 'crf': 23, 'tune': 'stillimage', 'gop': 60, 'audio_bitrate': '160k'},
+    'archival': {'preset': 'slow', 'crf': 18, 'tune': 'stillimage', 'gop': 30, 'audio_bitrate': '192k'},
+}
+DEFAULT_PROFILE = os.getenv("RENDER_PROFILE", "standard")
+# Per-variant overrides, e.g. RENDER_TARGET_PROFILES="preview=draft,vertical=archival"
+DEFAULT_TARGET_PROFILES = dict(
+    pair.strip().split("=", 1) for pair in os.getenv("RENDER_TARGET_PROFILES", "").split(",") if "=" in pair
+)
+
+# Output variants cut from the single 1080x1920 decode with split/asplit.
+# 'filter' is applied to the vertical master; crf/maxrate/audio override the render profile.
+OUTPUT_TARGETS = {
+    'vertical': {},
+    'portrait': {'filter': 'crop=1080:1350', 'suffix': '4x5'},
+    'square': {'filter': 'crop=1080:1080', 'suffix': '1x1'},
+    'preview': {'filter': 'scale=540:960', 'suffix': 'preview', 'crf': 30, 'maxrate': '900k', 'audio_bitrate': '96k'},
+}
+
+# Which variant each destination gets
+PLATFORM_TARGETS = {
+    'youtube': 'vertical',
+    'facebook': 'vertical',
+    'instagram': 'vertical',
+    'tiktok': 'vertical',
+    'instagram_feed': 'portrait',
+    'square': 'square',
+    'website': 'preview',
+}
+
+DEFAULT_TARGETS = [t.strip() for t in os.getenv("RENDER_TARGETS", "vertical").split(",") if t.strip() in OUTPUT_TARGETS]
+
 class VideoGenerator:
     """
     Generates vertical short-form videos from product images and script.
     Optimized for high-quality retention and social media aesthetic.
     """
     
-    def __init__(self):
+    def __init__(self, prepare_stills: bool = True, threads: int = None, segment_parallel: bool = None,
+                 targets: list = None, temp_dir: Path = None, profile: str = None,
+                 target_profiles: dict = None):
+        # Render profile for the run, optionally overridden per output variant
+        self.profile = profile or DEFAULT_PROFILE
+        if self.profile not in RENDER_PROFILES:
+            log.warning(f"⚠️ Unknown render profile '{self.profile}', using 'standard'")
+            self.profile = 'standard'
+        self.target_profiles = {t: p for t, p in (target_profiles or DEFAULT_TARGET_PROFILES).items() if p in RENDER_PROFILES}
+        # Output variants rendered in the same ffmpeg run ('vertical' is always included)
+        self.targets = ['vertical'] + [t for t in (targets or DEFAULT_TARGETS) if t != 'vertical' and t in OUTPUT_TARGETS]
+        # ffmpeg -threads per render (set by RenderScheduler when encoding in parallel)
+        self.threads = threads
+        # Encode each slide as its own intra-only clip in parallel, then a light final pass
+        if segment_parallel is None:
+            segment_parallel = os.getenv("RENDER_SEGMENT_PARALLEL", "").lower() in ("1", "true", "yes")
+        self.segment_parallel = segment_parallel
+        # Pre-scale images once with Pillow instead of scaling every frame in ffmpeg
+        self.prepare_stills = prepare_stills and still_frames.available()
         self.output_dir = Path("output_videos")
-        self.temp_dir = Path("temp")
+        self.temp_dir = Path(temp_dir) if temp_dir else Path("temp")
         self.assets_dir = Path("assets")
         self.output_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
         self.assets_dir.mkdir(exist_ok=True)
+        self.last_download_stats = []
+        self.last_encode_metrics = {}
+        self.last_artifacts = {}
+
+    def render_artifacts(self, product: dict, script: dict, voice_path: str = None) -> dict:
+        """
+        Renders every configured variant plus a poster frame in one ffmpeg pass and
+        returns {platform: path} (plus 'poster'). Empty dict on failure.
+        """
+        return self.last_artifacts if self.generate(product, script, voice_path=voice_path) else {}
+
+    def _artifact_paths(self, asin: str) -> dict:
+        paths = {}
+        for target in self.targets:
+            suffix = OUTPUT_TARGETS[target].get('suffix')
+            paths[target] = self.output_dir / (f"video_{asin}_{suffix}.mp4" if suffix else f"video_{asin}.mp4")
+        paths['poster'] = self.output_dir / f"video_{asin}_poster.jpg"
+        return paths
+
+    def _platform_artifacts(self, paths: dict) -> dict:
+        artifacts = {platform: str(paths[target]) for platform, target in PLATFORM_TARGETS.items() if target in paths}
+        artifacts['poster'] = str(paths['poster'])
+        return artifacts
 
     def generate(self, product: dict, script: dict, voice_path: str = None) -> str:
         """
-        Creates a vertical carousel video.
+        Creates a vertical carousel video. Extra variants (see self.targets) and a poster
+        JPEG come out of the same ffmpeg run; they are listed in self.last_artifacts.
         """
         asin = product.get('asin', 'unknown')
         output_path = self.output_dir / f"video_{asin}.mp4"
+        self.last_artifacts = {}
+        artifact_paths = self._artifact_paths(asin)
         image_urls = product.get('images', [product.get('image_url')])
         
         try:
-            # 1. Download up to 10 images (filter successful downloads)
-            local_images = []
+            # 1. Download up to 10 images concurrently (filter successful downloads)
             # Ensure image_urls is a list
             if not isinstance(image_urls, list):
                 if image_urls: image_urls = [image_urls]
                 else: image_urls = []
                 
-            for i, url in enumerate(image_urls[:10]):
-                path = self.temp_dir / f"img_{asin}_{i}.jpg"
-                if self._download_image(url, path):
-                    local_images.append(path)
+            local_images = self._fetch_images(image_urls[:10])
             
             # Ensure we have some images (pipeline ensures >= 5, but we check for safety)
             if not local_images:
@@ -50,15 +147,22 @@ class VideoGenerator:
             
             log.info(f"✓ Using {len(local_images)} image segments for carousel")
             
+            # Skip the encode entirely if the same inputs were already rendered
+            input_hash = self._render_input_hash(local_images, voice_path, script)
+            manifest_path = output_path.with_suffix(".manifest.json")
+            if self._manifest_matches(manifest_path, output_path, input_hash) and all(p.exists() for p in artifact_paths.values()):
+                log.info(f"♻️ Inputs unchanged, reusing rendered video: {output_path}")
+                self.last_artifacts = self._platform_artifacts(artifact_paths)
+                return str(output_path)
+            manifest_path.unlink(missing_ok=True)
+            
             # --- DYNAMIC DURATION LOGIC ---
             # Default to 18s if no voice, but if voice exists, measure it
             total_vid_dur = 18.0 # Default
             if voice_path and os.path.exists(voice_path):
                 try:
-                    # Use ffprobe to get accurate duration for MP3 files
-                    probe_cmd = f'ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{voice_path}"'
-                    result = subprocess.run(probe_cmd, shell=True, capture_output=True, text=True)
-                    voice_dur = float(result.stdout.strip())
+                    # Native header parse (WAV/MP3/AAC), cached next to the voice file
+                    voice_dur = probe_audio(voice_path)['duration_us'] / 1_000_000
                     total_vid_dur = voice_dur + 1.5  # Add buffer for smooth ending
                     log.info(f"🎤 Voice duration: {voice_dur:.2f}s. Setting video to {total_vid_dur:.2f}s")
                 except Exception as e:
@@ -73,9 +177,30 @@ class VideoGenerator:
             # 2. Build Filter Complex (Using list to avoid syntax errors)
             filter_chains = []
             
-            # 2.1 Input Scaling
+            # 2.1 Input Scaling (skipped when stills are already letterboxed to 1080x1920)
+            stills = still_frames.prepare_stills(local_images) if self.prepare_stills else None
+            if stills:
+                local_images = stills
+            base_filter = "setsar=1" if stills else SCALE_PAD_FILTER
+
+            # Per-slide inputs: looped images, or pre-encoded slide clips in segment-parallel mode
+            segments = None
+            if self.segment_parallel and num_images > 1:
+                segments = self._encode_segments(local_images, segment_dur, base_filter, asin)
+                if segments:
+                    base_filter = "setsar=1"
+                else:
+                    log.warning("⚠️ Segment encoding failed, falling back to single-pass render")
+            image_inputs = []
+            if segments:
+                for seg in segments:
+                    image_inputs += ["-i", seg]
+            else:
+                for img in local_images:
+                    image_inputs += ["-loop", "1", "-framerate", str(FRAME_RATE), "-t", f"{segment_dur}", "-i", img]
+
             for i in range(num_images):
-                filter_chains.append(f"[{i}:v]scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}_base]")
+                filter_chains.append(f"[{i}:v]{base_filter}[v{i}_base]")
 
             # 2.2 Transitions or Single Image Base
             if num_images == 1:
@@ -99,9 +224,9 @@ class VideoGenerator:
             bg_music = self.assets_dir / "background_music.mp3"
             
             if voice_path and os.path.exists(voice_path):
-                audio_inputs = f"-i {voice_path} "
+                audio_inputs = ["-i", voice_path]
                 if bg_music.exists():
-                    audio_inputs += f"-stream_loop -1 -i {bg_music} "
+                    audio_inputs += ["-stream_loop", "-1", "-i", bg_music]
                     bg_idx = voice_idx + 1
                     filter_chains.append(f"[{voice_idx}:a]volume=2.0[v_a]")
                     filter_chains.append(f"[{bg_idx}:a]volume=0.05,atrim=0:{total_vid_dur}[m_a]")
@@ -113,37 +238,53 @@ class VideoGenerator:
                 if output_path.exists(): output_path.unlink()
                 return None
 
+            # 2.4 Fan out one decode into every variant + the poster frame
+            n_video = len(self.targets)
+            filter_chains.append(f"[vout]split={n_video + 1}" + "".join(f"[vs{i}]" for i in range(n_video + 1)))
+            # Poster from the middle of the first slide, picked by timestamp so the input rate doesn't matter
+            filter_chains.append(f"[vs{n_video}]select=gte(t\\,{segment_dur / 2}),trim=end_frame=1[poster]")
+            if n_video > 1:
+                filter_chains.append(f"[aout]asplit={n_video}" + "".join(f"[as{i}]" for i in range(n_video)))
+
+            output_labels = []
+            for i, target in enumerate(self.targets):
+                video_label = f"[vs{i}]"
+                if OUTPUT_TARGETS[target].get('filter'):
+                    filter_chains.append(f"[vs{i}]{OUTPUT_TARGETS[target]['filter']},setsar=1[vt{i}]")
+                    video_label = f"[vt{i}]"
+                output_labels.append((target, video_label, f"[as{i}]" if n_video > 1 else "[aout]"))
+
             # Join all filters safely
             full_filter = "; ".join(filter_chains)
 
-            cmd = f'ffmpeg -y '
-            for img in local_images:
-                cmd += f'-loop 1 -t {segment_dur} -i {img} '
-            
-            # Standardize output format for maximum compatibility (QuickTime/iPhone)
-            # -ac 2 (Stereo)
-            # -ar 44100 (44.1kHz)
-            # -pix_fmt yuv420p (Required for broad H.264 support)
-            
-            cmd += (
-                f'{audio_inputs} -filter_complex "{full_filter}" '
-                f'-map "[vout]" -map "[aout]" '
-                f'-c:v libx264 -profile:v high -level:v 4.0 -pix_fmt yuv420p -crf 23 -r 30 '
-                f'-color_range 1 -colorspace bt709 -color_trc bt709 -color_primaries bt709 '
-                f'-c:a aac -b:a 192k -ac 2 -ar 44100 -shortest -t {total_vid_dur} -movflags +faststart {output_path}'
-            )
+            args = ["-y", *image_inputs, *audio_inputs, "-filter_complex", full_filter]
+            for target, video_label, audio_label in output_labels:
+                spec = {**RENDER_PROFILES[self.target_profiles.get(target, self.profile)], **OUTPUT_TARGETS[target]}
+                args += ["-map", video_label, "-map", audio_label, *self._video_args(spec)]
+                if self.threads:
+                    args += ["-threads", self.threads]
+                args += [*self._audio_args(spec), "-shortest", "-t", f"{total_vid_dur}",
+                         "-movflags", "+faststart", artifact_paths[target]]
+            args += ["-map", "[poster]", "-frames:v", "1", "-q:v", "3", artifact_paths['poster']]
             
             log.info(f"Generating video for {asin}...")
             # Run FFmpeg
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            result = run_ffmpeg(args, output_path=output_path, expected_duration=total_vid_dur, label=f"render {asin}")
+            self.last_encode_metrics = {k: v for k, v in result.items() if k != 'stderr'}
+            
+            if segments:
+                for seg in segments:
+                    seg.unlink(missing_ok=True)
             
-            if result.returncode != 0:
-                log.error(f"FFmpeg failed: {result.stderr}")
+            if not result['ok']:
+                log.error(f"FFmpeg failed: {result['stderr']}")
                 if output_path.exists(): output_path.unlink() # Delete broken file
                 return None
                 
             if output_path.exists() and output_path.stat().st_size > 0:
                 log.info(f"✅ Refined Video created: {output_path} ({output_path.stat().st_size/1024/1024:.2f} MB)")
+                self.last_artifacts = self._platform_artifacts(artifact_paths)
+                self._write_manifest(manifest_path, output_path, input_hash)
                 return str(output_path)
             else:
                 log.error("Video file created but is empty")
@@ -155,17 +296,107 @@ class VideoGenerator:
             if output_path.exists(): output_path.unlink() # Cleanup
             return None
 
-    def _download_image(self, url: str, path: Path) -> bool:
-        """Download image and return True if successful"""
+    @staticmethod
+    def _video_args(spec: dict) -> list:
+        """Encoder args for one output: render profile merged with the variant's overrides."""
+        args = [*VIDEO_ENCODER_ARGS, "-preset", spec['preset'], "-crf", str(spec['crf'])]
+        if spec.get('tune'):
+            args += ["-tune", spec['tune']]
+        if spec.get('gop'):
+            args += ["-g", str(spec['gop'])]
+        if spec.get('maxrate'):
+            args += ["-maxrate", spec['maxrate'], "-bufsize", spec['maxrate']]
+        return args
+
+    @staticmethod
+    def _audio_args(spec: dict) -> list:
+        return [*AUDIO_ENCODER_ARGS, "-b:a", spec['audio_bitrate']]
+
+    def _render_input_hash(self, images: list, voice_path, script: dict) -> str:
+        """Hash of everything that determines the output: image and voice bytes, script,
+        background music, filter template version, render mode and encoder settings."""
+        h = hashlib.sha256()
+
+        def add_file(path):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 16), b''):
+                    h.update(block)
+            h.update(b'\0')
+
+        for img in images:
+            add_file(img)
+        if voice_path and os.path.exists(voice_path):
+            add_file(voice_path)
+        bg_music = self.assets_dir / "background_music.mp3"
+        if bg_music.exists():
+            add_file(bg_music)
+        h.update(json.dumps({
+            'script': script,
+            'template': RENDER_TEMPLATE_VERSION,
+            'stills': self.prepare_stills,
+            'segment_parallel': self.segment_parallel,
+            'frame_rate': FRAME_RATE,
+            'video': VIDEO_ENCODER_ARGS,
+            'audio': AUDIO_ENCODER_ARGS,
+            'targets': {t: OUTPUT_TARGETS[t] for t in self.targets},
+            'profiles': {t: RENDER_PROFILES[self.target_profiles.get(t, self.profile)] for t in self.targets},
+        }, sort_keys=True, default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def _manifest_matches(manifest_path: Path, output_path: Path, input_hash: str) -> bool:
+        if not (manifest_path.exists() and output_path.exists()):
+            return False
         try:
-            if not url: return False
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                with open(path, 'wb') as f:
-                    f.write(response.content)
-                size_kb = path.stat().st_size / 1024
-                log.info(f"📥 Downloaded image: {path.name} ({size_kb:.1f} KB)")
-                return path.exists() and path.stat().st_size > 0
-        except Exception as e:
-            log.warning(f"Could not download image: {url} - {e}")
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            return (manifest.get('input_hash') == input_hash
+                    and manifest.get('output_bytes') == output_path.stat().st_size)
+        except Exception:
             return False
+
+    @staticmethod
+    def _write_manifest(manifest_path: Path, output_path: Path, input_hash: str):
+        try:
+            with open(manifest_path, 'w') as f:
+                json.dump({'input_hash': input_hash, 'output_bytes': output_path.stat().st_size,
+                           'template': RENDER_TEMPLATE_VERSION}, f, indent=2)
+        except OSError as e:
+            log.warning(f"⚠️ Could not write render manifest: {e}")
+
+    def _encode_segments(self, images: list, segment_dur: float, base_filter: str, asin: str):
+        """
+        Encodes every slide as a lossless intra-only FRAME_RATE clip of exactly segment_dur,
+        in parallel. The final pass then only crossfades, mixes audio and encodes H.264.
+        Returns the clip paths in order, or None if any slide fails.
+        """
+        def encode(i, img):
+            seg_path = self.temp_dir / f"seg_{asin}_{i}.mkv"
+            args = ["-y", "-loop", "1", "-framerate", str(FRAME_RATE), "-t", f"{segment_dur}", "-i", img,
+                    "-vf", f"{base_filter},format=yuv420p", "-c:v", "libx264", "-preset", "ultrafast",
+                    "-qp", "0", "-g", "1", "-threads", "1", "-an", seg_path]
+            result = run_ffmpeg(args, output_path=seg_path, expected_duration=segment_dur, label=f"segment {i}")
+            if not result['ok'] or not seg_path.exists():
+                log.error(f"Segment {i} encode failed: {result['stderr'][-500:]}")
+                return None
+            return seg_path
+
+        workers = self.threads or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(images)))) as pool:
+            segments = list(pool.map(encode, range(len(images)), images))
+        if not all(segments):
+            for seg in segments:
+                if seg: seg.unlink(missing_ok=True)
+            return None
+        log.info(f"🧩 Encoded {len(segments)} slide segments in parallel")
+        return segments
+
+    def _fetch_images(self, urls: list) -> list:
+        """Resolve images through the shared image store; returns successful local paths in order"""
+        store = ImageStore()
+        try:
+            local_images = [p for p in store.get_many(urls) if p]
+            self.last_download_stats = store.last_stats
+        finally:
+            store.close()
+        return local_images
@@ -6,16 +6,75 @@ import os
 import json
 import pickle
 import time
+import random
+import ssl
+import socket
+import http.client
+from pathlib import Path
+import httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
 import logging
 import base64
+from comment_queue import AffiliateCommentQueue, COMMENT_TEMPLATE
+from youtube_quota import get_quota_ledger
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("YouTubeUpload")
 
+# Resumable upload tuning: chunks must be a multiple of 256 KiB
+CHUNK_SIZE = int(os.getenv("YOUTUBE_UPLOAD_CHUNK_MB", "8")) * 1024 * 1024
+MAX_RETRIES = 8
+RETRIABLE_STATUS = (500, 502, 503, 504)
+# Transient transport failures only (dropped/reset connections, timeouts, TLS errors, truncated
+# responses); local errors such as a missing or unreadable video file must not be retried
+RETRIABLE_EXCEPTIONS = (ConnectionError, TimeoutError, socket.timeout, ssl.SSLError,
+                        http.client.IncompleteRead, http.client.ImproperConnectionState,
+                        http.client.BadStatusLine, httplib2.HttpLib2Error)
+# Resumable session URIs stay valid for about a week; don't resume anything older
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+SESSIONS_FILE = Path(os.getenv("YOUTUBE_UPLOAD_SESSIONS_FILE", DATA_DIR / "youtube_upload_sessions.json"))
+SESSION_MAX_AGE = 6 * 24 * 3600
+
+
+def _load_sessions() -> dict:
+    if SESSIONS_FILE.exists():
+        try:
+            with open(SESSIONS_FILE, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            log.warning(f"⚠️ Upload sessions file unreadable: {e}")
+    return {}
+
+
+def _save_sessions(sessions: dict):
+    try:
+        SESSIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SESSIONS_FILE.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(sessions, f, indent=2)
+        os.replace(tmp, SESSIONS_FILE)
+    except OSError as e:
+        log.warning(f"⚠️ Could not persist upload session: {e}")
+
+
+def _query_upload_status(request, enabled: bool = True):
+    """
+    googleapiclient has no public way to resume a session URI from an earlier process. Its
+    own error handling sets this flag after a failed chunk, which makes the next
+    next_chunk() ask the server for the committed byte range before sending data. This is
+    the only place that touches the private attribute.
+    """
+    request._in_error_state = enabled
+
+
+def _session_key(video_path) -> str:
+    st = os.stat(video_path)
+    return f"{os.path.abspath(video_path)}:{st.st_size}:{int(st.st_mtime)}"
+
 class ProductionYouTubeUploader:
     def __init__(self):
         # Added force-ssl for comment posting
@@ -25,6 +84,8 @@ class ProductionYouTubeUploader:
         ]
         self.credentials = self._get_production_credentials()
         self.youtube = build("youtube", "v3", credentials=self.credentials)
+        # Affiliate comments are posted in the background once processing finishes
+        self.comment_queue = AffiliateCommentQueue(self.credentials)
     
     def _get_production_credentials(self):
         """Get credentials from Env Vars (CI) or Local Files"""
@@ -126,7 +187,7 @@ class ProductionYouTubeUploader:
         try:
             log.info("💬 Posting affiliate link as first comment...")
             
-            comment_text = f"🔥 Get it here: {affiliate_link}\n\n#coolfinds #amazonfinds #techdeals"
+            comment_text = COMMENT_TEMPLATE.format(link=affiliate_link)
             
             comment_request = {
                 'snippet': {
@@ -140,6 +201,7 @@ class ProductionYouTubeUploader:
             }
             
             # Post comment
+            get_quota_ledger().record('commentThreads.insert')
             response = self.youtube.commentThreads().insert(
                 part='snippet',
                 body=comment_request
@@ -157,8 +219,76 @@ class ProductionYouTubeUploader:
             log.error(f"❌ Failed to post comment: {e}")
             return False
 
+    def _upload_resumable(self, request, video_path):
+        """
+        Drives a chunked resumable upload with next_chunk(). The session URI is saved after
+        the first chunk so an interrupted upload (even in a later run) continues from the
+        last byte YouTube acknowledged. 5xx and transport errors are retried with backoff.
+        """
+        key = _session_key(video_path)
+        sessions = _load_sessions()
+        saved = sessions.get(key)
+        if saved and time.time() - saved.get('created_at', 0) < SESSION_MAX_AGE:
+            log.info("🔁 Resuming previous YouTube upload session...")
+            request.resumable_uri = saved['uri']
+            _query_upload_status(request)
+        else:
+            saved = None
+
+        total = os.path.getsize(video_path)
+        start = time.time()
+        retries = 0
+        response = None
+        while response is None:
+            try:
+                status, response = request.next_chunk()
+                retries = 0
+                if request.resumable_uri and sessions.get(key, {}).get('uri') != request.resumable_uri:
+                    # A new upload session is where videos.insert gets charged
+                    get_quota_ledger().record('videos.insert')
+                    sessions[key] = {'uri': request.resumable_uri, 'created_at': time.time()}
+                    _save_sessions(sessions)
+                if status:
+                    sent = status.resumable_progress
+                    log.info(f"⏫ YouTube upload {status.progress():.0%} "
+                             f"({sent / 1024 / 1024:.1f}/{total / 1024 / 1024:.1f} MB)")
+            except HttpError as e:
+                code = e.resp.status
+                if code in (404, 410) and saved:
+                    # Session expired on YouTube's side: start over with a fresh one
+                    log.warning("⚠️ Saved upload session is gone, restarting upload")
+                    sessions.pop(key, None)
+                    _save_sessions(sessions)
+                    request.resumable_uri = None
+                    request.resumable_progress = 0
+                    _query_upload_status(request, False)
+                    saved = None
+                    continue
+                if code not in RETRIABLE_STATUS:
+                    raise
+                error = f"HTTP {code}"
+            except RETRIABLE_EXCEPTIONS as e:
+                # next_chunk() flags the request itself, so the retry re-syncs the byte offset
+                error = f"{type(e).__name__}: {e}"
+            else:
+                continue
+
+            retries += 1
+            if retries > MAX_RETRIES:
+                log.error(f"❌ YouTube upload gave up after {MAX_RETRIES} retries ({error}); session kept for next run")
+                return None
+            wait = min(2 ** retries, 64) + random.random()
+            log.warning(f"⚠️ YouTube upload error ({error}), retry {retries}/{MAX_RETRIES} in {wait:.1f}s")
+            time.sleep(wait)
+
+        sessions.pop(key, None)
+        _save_sessions(sessions)
+        elapsed = time.time() - start
+        log.info(f"📶 Uploaded {total / 1024 / 1024:.1f} MB in {elapsed:.1f}s ({total / 1024 / 1024 / max(elapsed, 0.001):.2f} MB/s)")
+        return response
+
     def upload_video(self, video_path, title, description, tags=None, affiliate_link=None):
-        """Upload video to YouTube and post affiliate comment"""
+        """Upload video to YouTube and queue the affiliate comment (returns right after the insert)"""
         try:
             log.info(f"📤 Starting production upload: {video_path}")
             
@@ -179,7 +309,7 @@ class ProductionYouTubeUploader:
             # Media file
             media = MediaFileUpload(
                 video_path,
-                chunksize=-1,
+                chunksize=CHUNK_SIZE,
                 resumable=True
             )
             
@@ -191,16 +321,14 @@ class ProductionYouTubeUploader:
                 media_body=media
             )
             
-            response = request.execute()
-            video_id = response.get('id')
+            response = self._upload_resumable(request, video_path)
+            video_id = response.get('id') if response else None
             
             if video_id:
                 log.info(f"✅ Upload successful! ID: {video_id}")
                 
                 if affiliate_link:
-                    log.info("⏳ Waiting for video processing (15s) for comment...")
-                    time.sleep(15)
-                    self.post_affiliate_comment(video_id, affiliate_link)
+                    self.comment_queue.enqueue(video_id, affiliate_link)
                 
                 return video_id
             else:
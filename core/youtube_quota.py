@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+YouTube Quota Ledger - tracks YouTube Data API units spent per method per UTC day in
+data/youtube_quota.json, so the pipeline can tell how many uploads still fit in today's
+quota before it spends render time on them.
+"""
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+log = logging.getLogger("YouTubeQuota")
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+LEDGER_FILE = Path(os.getenv("YOUTUBE_QUOTA_FILE", DATA_DIR / "youtube_quota.json"))
+DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+# Units held back for manual fixes / unexpected calls
+RESERVE_UNITS = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "200"))
+KEEP_DAYS = 14
+
+# Data API v3 cost per call
+METHOD_COSTS = {
+    'videos.insert': 1600,
+    'commentThreads.insert': 50,
+    'videos.list': 1,
+    'commentThreads.list': 1,
+}
+# Status polls the comment queue typically needs before a video is processed
+EXPECTED_STATUS_POLLS = 10
+
+
+def quota_day(now: datetime = None) -> str:
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+
+
+def next_window(now: datetime = None) -> datetime:
+    """Start of the next quota day (UTC midnight)."""
+    now = now or datetime.now(timezone.utc)
+    return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class QuotaLedger:
+    def __init__(self, ledger_file: Path = LEDGER_FILE, daily_quota: int = DAILY_QUOTA,
+                 reserve: int = RESERVE_UNITS):
+        self.ledger_file = Path(ledger_file)
+        self.daily_quota = daily_quota
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._days = self._load()
+
+    def _load(self) -> dict:
+        if self.ledger_file.exists():
+            try:
+                with open(self.ledger_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning(f"⚠️ Quota ledger unreadable, starting fresh: {e}")
+        return {}
+
+    def _save(self):
+        try:
+            self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+            keep = sorted(self._days)[-KEEP_DAYS:]
+            tmp = self.ledger_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({d: self._days[d] for d in keep}, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.ledger_file)
+        except OSError as e:
+            log.warning(f"⚠️ Could not persist quota ledger: {e}")
+
+    def record(self, method: str, units: int = None, calls: int = 1):
+        """Charges one API call (or several) to today's ledger."""
+        cost = (METHOD_COSTS.get(method, 1) if units is None else units) * calls
+        with self._lock:
+            today = self._days.setdefault(quota_day(), {})
+            today[method] = today.get(method, 0) + cost
+            self._save()
+
+    def used(self, day: str = None) -> int:
+        with self._lock:
+            return sum(self._days.get(day or quota_day(), {}).values())
+
+    def by_method(self, day: str = None) -> dict:
+        with self._lock:
+            return dict(self._days.get(day or quota_day(), {}))
+
+    def remaining(self) -> int:
+        return max(0, self.daily_quota - self.reserve - self.used())
+
+    @staticmethod
+    def publish_cost(with_comment: bool = True) -> int:
+        """Units one published video costs: the upload plus, optionally, the affiliate comment."""
+        cost = METHOD_COSTS['videos.insert']
+        if with_comment:
+            cost += METHOD_COSTS['commentThreads.insert'] + EXPECTED_STATUS_POLLS * METHOD_COSTS['videos.list']
+        return cost
+
+    def capacity(self, with_comment: bool = True) -> int:
+        """How many more videos fit in today's quota."""
+        return self.remaining() // self.publish_cost(with_comment)
+
+    def report(self) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            'day': quota_day(now),
+            'used': self.used(),
+            'daily_quota': self.daily_quota,
+            'remaining': self.remaining(),
+            'capacity': self.capacity(),
+            'resets_in_hours': round((next_window(now) - now).total_seconds() / 3600, 1),
+            'by_method': self.by_method(),
+        }
+
+    def log_report(self):
+        r = self.report()
+        log.info(f"📊 YouTube quota {r['day']}: {r['used']}/{r['daily_quota']} units used, "
+                 f"room for {r['capacity']} more uploads (resets in {r['resets_in_hours']}h)")
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Process-wide ledger shared by the uploader and the comment queue."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
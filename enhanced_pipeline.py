@@ -134,6 +134,7 @@ def get_high_performance_products(count_candidates=15, select_top=3, min_price=6
         from advanced_scraper import AdvancedScraper
         from groq_generators import GroqProductSelector
         from strategy_monitor import StrategyMonitor
+        from category_classifier import classify_product
         
         scraper = AdvancedScraper(associate_tag=AFFILIATE_TAG)
         
@@ -155,7 +156,8 @@ def get_high_performance_products(count_candidates=15, select_top=3, min_price=6
             log.error("❌ No AI keys found for selection.")
             return []
             
-        monitor = StrategyMonitor(DATA_DIR)
+        from run_catalog import get_run_catalog
+        monitor = StrategyMonitor(catalog=get_run_catalog())
         
         # 0. Get all existing ASINs to prevent duplicates
         existing_asins = get_all_existing_asins()
@@ -267,13 +269,12 @@ def get_high_performance_products(count_candidates=15, select_top=3, min_price=6
                 # Merge details back, preserving selection metadata
                 p.update(details)
                 
-                # AI Re-categorization (Robust alignment)
+                # Re-categorization: local model first, LLM only on low confidence
                 try:
-                    log.info(f"🧠 AI Re-categorizing {p['asin']}...")
-                    p['category'] = selector.classify_product(p)
+                    p['category'] = classify_product(p, selector)
                     log.info(f"📌 Final Category: {p['category']}")
                 except Exception as e:
-                    log.warning(f"⚠️ AI re-categorization failed: {e}. Keeping original: {p['category']}")
+                    log.warning(f"⚠️ Re-categorization failed: {e}. Keeping original: {p['category']}")
 
                 p['website_link'] = get_enhanced_website_link(p)
                 p['affiliate_url'] = f"https://www.amazon.com/dp/{p['asin']}?tag={AFFILIATE_TAG}"
@@ -294,43 +295,18 @@ def get_high_performance_products(count_candidates=15, select_top=3, min_price=6
 
 def get_all_existing_asins():
     """Compiles a list of ASINs from both processing history and website database"""
-    existing = set()
-    
-    # Check main products file
-    for db_path in [AMAZING_DATA_DIR / "products.json", DATA_DIR / "products.json", DATA_DIR / "processed_products.json"]:
-        if db_path.exists():
-            try:
-                with open(db_path, 'r') as f:
-                    data = json.load(f)
-                    for item in data: 
-                        if isinstance(item, dict) and 'asin' in item:
-                            existing.add(item['asin'])
-            except: pass
-        
-    return existing
+    try:
+        from run_catalog import get_run_catalog
+        return get_run_catalog().all_asins()
+    except Exception as e:
+        log.warning(f"Error reading product catalog: {e}")
+        return set()
 
 def get_recent_asins():
     """Get list of recently processed ASINs"""
     try:
-        history_file = DATA_DIR / "processed_products.json"
-        if history_file.exists():
-            with open(history_file, 'r') as f:
-                processed = json.load(f)
-            
-            # Get ASINs from last 7 days
-            recent_asins = []
-            cutoff_time = time.time() - (7 * 24 * 60 * 60)  # 7 days ago
-            
-            for item in processed:
-                if 'processed_at' in item:
-                    try:
-                        processed_time = datetime.fromisoformat(item['processed_at']).timestamp()
-                        if processed_time > cutoff_time:
-                            recent_asins.append(item['asin'])
-                    except:
-                        continue
-            
-            return recent_asins
+        from run_catalog import get_run_catalog
+        return get_run_catalog().recent_asins(days=7)
     except Exception as e:
         log.warning(f"Error reading processed history: {e}")
     
@@ -339,29 +315,16 @@ def get_recent_asins():
 def save_processed_product(product):
     """Save COMPLETE product data to processed history with uploaded images"""
     try:
-        history_file = DATA_DIR / "processed_products.json"
-        processed = []
-        
-        if history_file.exists():
-            try:
-                with open(history_file, 'r') as f:
-                    processed = json.load(f)
-                if not isinstance(processed, list):
-                    processed = []
-            except:
-                processed = []
+        from catalog_store import HISTORY, HISTORY_LIMIT
+        from run_catalog import get_run_catalog
+        catalog = get_run_catalog()
         
         clean_product = serialize_for_json(product)
         
         product_category = clean_product.get('category')
         if not product_category or product_category == 'unknown':
-            title = clean_product.get('title', '').lower()
-            if any(w in title for w in ['laptop', 'phone', 'tablet', 'headphone', 'camera', 'gaming', 'monitor', 'keyboard', 'mouse', 'smart', 'tech', 'electronic']):
-                product_category = 'Tech'
-            elif any(w in title for w in ['dash', 'car', 'auto', 'vehicle']):
-                product_category = 'Home & Auto'
-            else:
-                product_category = 'Life & Style'
+            from category_classifier import classify_product
+            product_category = classify_product(clean_product)
             log.info(f"🔄 Derived category for {clean_product.get('asin')}: {product_category}")
         
         asin = clean_product.get('asin', '')
@@ -401,25 +364,94 @@ def save_processed_product(product):
             'youtube_url': clean_product.get('youtube_url'),
         }
         
-        asins = [p.get('asin') for p in processed]
-        existing_idx = asins.index(full_product_data['asin']) if full_product_data['asin'] in asins else -1
-        
-        if existing_idx >= 0:
-            processed[existing_idx] = full_product_data
-        else:
-            processed.append(full_product_data)
-        
+        catalog.upsert(HISTORY, full_product_data)
         # Keep only last 100 processed products
-        processed = processed[-100:]
-        
-        with open(history_file, 'w') as f:
-            json.dump(processed, f, indent=2)
+        catalog.trim(HISTORY, HISTORY_LIMIT)
         
         log.info(f"✅ Product saved to processed history: {product['asin']}")
         
     except Exception as e:
         log.error(f"Error saving processed product: {e}")
 
+PUBLISH_PLATFORMS = ('youtube', 'facebook', 'instagram', 'tiktok')
+
+def platform_configured(platform, yt_up=None, meta_up=None, tt_up=None):
+    """True if this run has an uploader with credentials for the platform"""
+    if platform == 'youtube':
+        return yt_up is not None
+    if platform in ('facebook', 'instagram'):
+        return meta_up is not None and meta_up.is_configured(platform)
+    if platform == 'tiktok':
+        return tt_up is not None and tt_up.is_configured()
+    return False
+
+def build_upload_task(platform, video_path, payload, yt_up=None, meta_up=None, tt_up=None):
+    """Zero-arg upload callable for one platform, or None if its uploader has no credentials"""
+    if not platform_configured(platform, yt_up, meta_up, tt_up):
+        return None
+    if platform == 'youtube':
+        return lambda: yt_up.upload_video(video_path, payload['title'], payload['description'],
+                                          payload.get('hashtags', []), affiliate_link=payload.get('affiliate_url'))
+    if platform == 'facebook':
+        return lambda: meta_up.upload_to_facebook(video_path, payload['caption'])
+    if platform == 'instagram':
+        return lambda: meta_up.start_instagram_upload(video_path, payload['caption'])
+    if platform == 'tiktok':
+        return lambda: tt_up.upload_video(video_path, payload['title'])
+    return None
+
+def record_youtube_upload(asin, video_id):
+    """Backfill a late YouTube upload into the processed history entry"""
+    try:
+        from catalog_store import HISTORY
+        from run_catalog import get_run_catalog
+        get_run_catalog().patch(HISTORY, asin, youtube_video_id=video_id,
+                                youtube_url=f"https://youtube.com/watch?v={video_id}")
+    except Exception as e:
+        log.warning(f"⚠️ Could not record YouTube upload for {asin}: {e}")
+
+def drain_publish_outbox(outbox, yt_up=None, meta_up=None, tt_up=None, quota=None):
+    """Retries due publish jobs from earlier runs against their existing MP4s"""
+    jobs = outbox.due()
+    if not jobs:
+        return 0
+    log.info(f"📬 Retrying {len(jobs)} pending publish jobs from earlier runs...")
+    from upload_dispatcher import UploadDispatcher
+    from youtube_quota import next_window
+    dispatcher = UploadDispatcher()
+    youtube_slots = quota.capacity() if quota else len(jobs)
+    keys = {}
+    for job in jobs:
+        if job['platform'] in keys.get(job['asin'], {}):
+            continue  # one upload per (asin, platform) per drain; the other job stays pending
+        task = build_upload_task(job['platform'], job['video_path'], job['payload'], yt_up, meta_up, tt_up)
+        if task is None:
+            continue  # uploader not configured this run; job stays pending
+        if job['platform'] == 'youtube':
+            if youtube_slots <= 0:
+                outbox.defer(job['idempotency_key'], next_window().timestamp(), 'deferred: YouTube quota exhausted')
+                continue
+            youtube_slots -= 1
+        outbox.mark_started(job['idempotency_key'])
+        keys.setdefault(job['asin'], {})[job['platform']] = (job['idempotency_key'], task)
+    for asin, tasks in keys.items():
+        dispatcher.submit(asin, {platform: task for platform, (_, task) in tasks.items()})
+
+    recovered = 0
+    for asin, results in dispatcher.results():
+        for platform, upload in results.items():
+            key = keys[asin][platform][0]
+            if upload['ok']:
+                outbox.complete(key, upload['value'])
+                recovered += 1
+                if platform == 'youtube':
+                    record_youtube_upload(asin, upload['value'])
+            else:
+                outbox.fail(key, upload['error'] or 'upload returned no result')
+    dispatcher.close()
+    log.info(f"📬 Outbox drain: {recovered}/{sum(len(t) for t in keys.values())} retried uploads succeeded")
+    return recovered
+
 def run_enhanced_pipeline():
     """Run enhanced pipeline with robust error handling and reporting"""
     log.info("🚀 STARTING ENHANCED AUTOMATED PIPELINE...")
@@ -428,6 +460,10 @@ def run_enhanced_pipeline():
     success_count = 0
     failure_count = 0
     processed_successfully = []
+
+    # Per-run scratch space for voice files and render temporaries
+    from run_workspace import RunWorkspace
+    workspace = RunWorkspace()
     
     try:
         # Import YouTube uploader - we'll create it inline
@@ -464,8 +500,23 @@ def run_enhanced_pipeline():
         
         try:
             from groq_generators import GroqVoiceGenerator
-            voice_gen = GroqVoiceGenerator(os.getenv("GROQ_API_KEY"))
+            voice_gen = GroqVoiceGenerator(os.getenv("GROQ_API_KEY"), voice_dir=workspace.stage_dir('voice'))
         except: voice_gen = None
+
+        # Step 0: Retry uploads that failed in earlier runs (existing MP4s only)
+        from publish_outbox import PublishOutbox
+        from youtube_quota import get_quota_ledger, next_window
+        quota = get_quota_ledger()
+        if yt_up:
+            quota.log_report()
+        outbox = PublishOutbox()
+        for asin, pending_video in outbox.pending_videos():
+            workspace.track(asin, 'video', pending_video)
+        workspace.enforce_quota()
+        drain_publish_outbox(outbox, yt_up, meta_up, tt_up, quota=quota)
+
+        # YouTube uploads that still fit in today's quota; the rest go to the outbox
+        youtube_slots = quota.capacity() if yt_up else 0
         
         # Step 1: Discover products with dynamic fallback
         log.info("🎯 Step 1: Discovering Strategic Candidates...")
@@ -497,8 +548,16 @@ def run_enhanced_pipeline():
         log.info(f"✨ Found {len(selected_products)} strategic candidates. Starting production...")
         
         processed_successfully = []
+        render_jobs = []
+        critical_error = None
+        # Platforms other than YouTube that can actually publish this run
+        other_platforms = [p for p in PUBLISH_PLATFORMS
+                           if p != 'youtube' and platform_configured(p, yt_up, meta_up, tt_up)]
 
         for product in selected_products:
+            if yt_up and youtube_slots <= 0 and not other_platforms:
+                log.warning("🛑 YouTube quota exhausted and no other platform configured; not rendering more videos")
+                break
             try:
                 # 2. Scripting (OpenRouter)
                 log.info("🎤 Generating script (OpenRouter)...")
@@ -540,6 +599,14 @@ def run_enhanced_pipeline():
                     raise CriticalPipelineError(f"Empty voiceover from Groq for {product['asin']}.")
                 
                 product['voice_path'] = voice_path
+                workspace.track(product['asin'], 'voice', voice_path)
+                try:
+                    from audio_metadata import probe_audio
+                    probe_audio(voice_path)  # writes {voice}.meta.json for the render stage
+                except Exception as e:
+                    log.warning(f"⚠️ Could not read voice metadata: {e}")
+                if voice_gen.last_chunk_timestamps:
+                    product['voice_chunks'] = voice_gen.last_chunk_timestamps
                 
                 # VALIDATION: Check all prerequisites before creating video
                 image_count = len(product.get('images', []))
@@ -554,53 +621,106 @@ def run_enhanced_pipeline():
                     continue
                 
                 log.info(f"✅ Validation passed: script ✓, voice ✓, images ({image_count}) ✓")
-                
-                # 4. Video production
-                log.info("🎥 Generating video...")
-                from video_generator import VideoGenerator
-                video_gen_instance = VideoGenerator()
-                video_path = video_gen_instance.generate(product, script, voice_path=voice_path)
-                
+                publish_youtube = youtube_slots > 0
+                if publish_youtube:
+                    youtube_slots -= 1
+                render_jobs.append({'product': product, 'script': script, 'voice_path': voice_path,
+                                    'publish_youtube': publish_youtube})
+
+            except CriticalPipelineError as e:
+                log.error(f"🛑 CRITICAL FAILURE: {e}. Stopping pipeline to retry later.")
+                # We stop the entire pipeline as per user requirement, but still
+                # render and publish the products that are already scripted/voiced
+                critical_error = e
+                break
+            except GroqQuotaExceeded as e:
+                log.error(f"🛑 STOPPING PIPELINE: Groq Quota hit. Will retry in next scheduled run. Error: {e}")
+                # We stop processing more products to save quota and wait for refresh
+                break 
+            except Exception as e:
+                log.error(f"❌ Error processing {product['asin']}: {e}")
+                failure_count += 1
+                continue
+
+        # 4. Video production (parallel renders, uploads fan out as each one finishes)
+        log.info(f"🎥 Generating {len(render_jobs)} videos...")
+        from render_scheduler import RenderScheduler
+        from upload_dispatcher import UploadDispatcher
+        scheduler = RenderScheduler(temp_dir=str(workspace.stage_dir('render')))
+        dispatcher = UploadDispatcher()
+        outbox_keys = {}
+
+        for result in scheduler.run(render_jobs):
+            job = render_jobs[result['index']]
+            product, script, video_path = job['product'], job['script'], result['video_path']
+            try:
                 if not video_path:
                     log.error(f"❌ Video production failed for {product['asin']}")
                     failure_count += 1
                     continue
-                
-                # 5. Distribution
-                # 5.1 YouTube
-                if yt_up:
-                    log.info("📹 Uploading to YouTube...")
-                    try:
-                        desc = f"{script['narration']}\n\n🔥 Check it out: {product['website_link']['link']}\n\n" + " ".join(script.get('hashtags', []))
-                        video_id = yt_up.upload_video(video_path, script['title'], desc, script.get('hashtags', []), affiliate_link=product['affiliate_url'])
-                        if video_id:
-                            product['youtube_uploaded'] = True
-                            product['youtube_video_id'] = video_id
-                            product['youtube_url'] = f"https://youtube.com/watch?v={video_id}"
-                            log.info(f"✅ YouTube metadata saved for {product['asin']}")
-                            
-                            # Parallel website update
-                            threading.Thread(target=update_website_parallel, args=(product,), daemon=True).start()
-                    except Exception as e:
-                        log.warning(f"⚠️ YouTube upload failed: {e}")
-
-                # 5.2 Meta (Facebook & Instagram)
-                if meta_up:
-                    log.info("📸 Uploading to Meta (FB/IG)...")
-                    caption = f"{script['narration']}\n\nProduct: {product['website_link']['link']}\n\n" + " ".join(script.get('hashtags', []))
-                    try:
-                        meta_up.upload_to_facebook(video_path, caption)
-                        meta_up.upload_to_instagram(video_path, caption)
-                    except Exception as e:
-                        log.warning(f"⚠️ Meta upload failed: {e}")
-
-                # 5.3 TikTok
-                if tt_up:
-                    log.info("🎵 Uploading to TikTok...")
-                    try:
-                        tt_up.upload_video(video_path, script['title'])
-                    except Exception as e:
-                        log.warning(f"⚠️ TikTok upload failed: {e}")
+                product['video_path'] = video_path
+                product['render_metrics'] = {'seconds': result['seconds'], **result['encode']}
+                product['video_artifacts'] = result['artifacts']
+                workspace.track(product['asin'], 'video', video_path, *result['artifacts'].values())
+
+                # 5. Distribution: every platform starts at once, each job recorded in the outbox
+                payload = {
+                    'title': script['title'],
+                    'description': f"{script['narration']}\n\n🔥 Check it out: {product['website_link']['link']}\n\n" + " ".join(script.get('hashtags', [])),
+                    'caption': f"{script['narration']}\n\nProduct: {product['website_link']['link']}\n\n" + " ".join(script.get('hashtags', [])),
+                    'hashtags': script.get('hashtags', []),
+                    'affiliate_url': product['affiliate_url'],
+                }
+                uploads = {}
+                outbox_keys[result['index']] = {}
+                for platform in PUBLISH_PLATFORMS:
+                    task = build_upload_task(platform, video_path, payload, yt_up, meta_up, tt_up)
+                    if task is None:
+                        continue
+                    key = outbox.enqueue(product['asin'], platform, video_path, payload)
+                    if outbox.state(key) == 'done':
+                        log.info(f"⏭️ {platform}: this video was already published for {product['asin']}")
+                        continue
+                    if platform == 'youtube' and not job['publish_youtube']:
+                        log.info(f"⏳ YouTube quota used up: {product['asin']} deferred to the next quota window")
+                        outbox.defer(key, next_window().timestamp(), 'deferred: YouTube quota exhausted')
+                        continue
+                    outbox.mark_started(key)
+                    outbox_keys[result['index']][platform] = key
+                    uploads[platform] = task
+                log.info(f"📤 Uploading {product['asin']} to {', '.join(uploads) or 'no platforms'}...")
+                dispatcher.submit(result['index'], uploads, label=product['asin'])
+            except Exception as e:
+                log.error(f"❌ Error distributing {product['asin']}: {e}")
+                failure_count += 1
+                continue
+
+        for index, uploads in dispatcher.results():
+            product = render_jobs[index]['product']
+            for platform, upload in uploads.items():
+                key = outbox_keys[index][platform]
+                if upload['ok']:
+                    outbox.complete(key, upload['value'])
+                else:
+                    outbox.fail(key, upload['error'] or 'upload returned no result')
+            try:
+                yt = uploads.get('youtube')
+                if yt and yt['ok']:
+                    video_id = yt['value']
+                    product['youtube_uploaded'] = True
+                    product['youtube_video_id'] = video_id
+                    product['youtube_url'] = f"https://youtube.com/watch?v={video_id}"
+                    log.info(f"✅ YouTube metadata saved for {product['asin']}")
+
+                    # Parallel website update
+                    threading.Thread(target=update_website_parallel, args=(product,), daemon=True).start()
+                elif yt:
+                    log.warning(f"⚠️ YouTube upload failed: {yt['error'] or 'no video id'}")
+                if 'facebook' in uploads or 'instagram' in uploads:
+                    product['meta_uploaded'] = any(uploads[p]['ok'] for p in ('facebook', 'instagram') if p in uploads)
+                if 'tiktok' in uploads:
+                    product['tiktok_uploaded'] = uploads['tiktok']['ok']
+                product['upload_seconds'] = {p: r['seconds'] for p, r in uploads.items()}
 
                 # Tracking & Success logic
                 processed_successfully.append(product)
@@ -626,21 +746,22 @@ def run_enhanced_pipeline():
                 })
 
                 success_count += 1
+                workspace.release(product['asin'])
                 log.info(f"✅ Finished production & distribution for {product['asin']}!")
-                time.sleep(5) # Give APIs a breather
 
-            except CriticalPipelineError as e:
-                log.error(f"🛑 CRITICAL FAILURE: {e}. Stopping pipeline to retry later.")
-                # We stop the entire pipeline as per user requirement
-                raise e 
-            except GroqQuotaExceeded as e:
-                log.error(f"🛑 STOPPING PIPELINE: Groq Quota hit. Will retry in next scheduled run. Error: {e}")
-                # We stop processing more products to save quota and wait for refresh
-                break 
             except Exception as e:
-                log.error(f"❌ Error processing {product['asin']}: {e}")
+                log.error(f"❌ Error distributing {product['asin']}: {e}")
                 failure_count += 1
                 continue
+        dispatcher.close()
+        if yt_up:
+            yt_up.comment_queue.drain()
+        log.info(f"📬 Publish outbox: {outbox.stats()}")
+        if yt_up:
+            quota.log_report()
+
+        if critical_error:
+            raise critical_error
         
         # Save all successful products to website data at once
         if processed_successfully:
@@ -652,6 +773,18 @@ def run_enhanced_pipeline():
             log.info("📊 PIPELINE EXECUTION SUMMARY")
             log.info(f"🟢 Successes: {success_count}")
             log.info(f"🔴 Failures:  {failure_count}")
+            if scheduler.last_summary:
+                rs = scheduler.last_summary
+                log.info(f"🎬 Renders: {rs['videos']} in {rs['wall_seconds']}s ({rs['videos_per_hour']} videos/hour, "
+                         f"{rs['encode_cpu_seconds']} CPU s)")
+            uploads_summary = dispatcher.summary()
+            for platform, st in uploads_summary['platforms'].items():
+                log.info(f"📤 {platform}: {st['uploads']} uploads, avg {st['avg_seconds']}s, max {st['max_seconds']}s")
+            if uploads_summary['products']:
+                log.info(f"📤 Avg publish time per product: {uploads_summary['avg_publish_seconds']}s")
+            if voice_gen:
+                tts = voice_gen.cache.stats()
+                log.info(f"🎙️ TTS cache: {tts['hits']}/{tts['hits'] + tts['misses']} hits ({tts['hit_rate']:.0%}), ~{tts['seconds_saved']}s saved")
             log.info(f"🕒 Time: {datetime.now().strftime('%H:%M:%S')}")
             log.info("=" * 60)
 
@@ -685,6 +818,10 @@ def run_enhanced_pipeline():
             log.warning(f"💾 Saving {len(processed_successfully)} successful products before exit...")
             update_website_data(processed_successfully)
         return False
+    finally:
+        from run_catalog import flush_run_catalog
+        flush_run_catalog()
+        workspace.close()
 
 # Keep existing functions
 def get_website_link(product):
@@ -733,29 +870,17 @@ def send_to_make(product):
 def update_website_data(new_products):
     """Sync product data to website JSON files with MERGING logic"""
     try:
-        site_db = AMAZING_DATA_DIR / "products.json"
-        existing_products = []
+        from catalog_store import SITE, HISTORY
+        from run_catalog import get_run_catalog
+        catalog = get_run_catalog()
+        existing_products = catalog.products(SITE)
         
-        if site_db.exists():
-            try:
-                with open(site_db, 'r') as f:
-                    existing_products = json.load(f)
-                    if not isinstance(existing_products, list):
-                        existing_products = []
-            except Exception as e:
-                log.warning(f"⚠️ Could not load existing products.json: {e}")
-        
-        # If website has very few products, try to restore from processed_products.json as base
+        # If website has very few products, try to restore from processed history as base
         if len(existing_products) < 5:
-            processed_file = DATA_DIR / "processed_products.json"
-            if processed_file.exists():
-                try:
-                    with open(processed_file, 'r') as f:
-                        backup_products = json.load(f)
-                    if len(backup_products) > len(existing_products):
-                        log.info(f"🔄 Restoring {len(backup_products)} products from processed history as base")
-                        existing_products = backup_products
-                except: pass
+            backup_products = catalog.products(HISTORY)
+            if len(backup_products) > len(existing_products):
+                log.info(f"🔄 Restoring {len(backup_products)} products from processed history as base")
+                existing_products = backup_products
         
         # Protect existing products - never lose them if we have enough
         if len(existing_products) >= 50 and new_products and len(new_products) < 3:
@@ -795,13 +920,8 @@ def update_website_data(new_products):
         no_cat_count = 0
         for p in merged_list:
             if not p.get('category') or p.get('category') == 'unknown':
-                title = p.get('title', '').lower()
-                if any(w in title for w in ['laptop', 'phone', 'tablet', 'headphone', 'camera', 'gaming', 'monitor', 'keyboard', 'mouse', 'smart', 'tech', 'electronic']):
-                    p['category'] = 'Tech'
-                elif any(w in title for w in ['dash', 'car', 'auto', 'vehicle']):
-                    p['category'] = 'Home & Auto'
-                else:
-                    p['category'] = 'Life & Style'
+                from category_classifier import classify_product
+                p['category'] = classify_product(p)
                 no_cat_count += 1
         
         if no_cat_count > 0:
@@ -814,11 +934,9 @@ def update_website_data(new_products):
             log.info(f"🔄 Replacing {len(existing_products)} old products with {len(valid_new_products)} new valid products")
             merged_list = valid_new_products
             
-        # Save to both locations
-        with open(DATA_DIR / "products.json", 'w') as f:
-            json.dump(merged_list, f, indent=2)
-        with open(site_db, 'w') as f:
-            json.dump(merged_list, f, indent=2)
+        # Save to the catalog and regenerate the website JSON exports before deploying
+        catalog.replace(SITE, merged_list)
+        catalog.flush()
         
         log.info(f"✅ Data synchronized to website files ({len(merged_list)} total products)")
         
@@ -831,39 +949,12 @@ def update_website_data(new_products):
 def update_website_parallel(product):
     """Update single product to website immediately in background"""
     try:
-        import fcntl
-        site_db = AMAZING_DATA_DIR / "products.json"
-        lock_file = AMAZING_DATA_DIR / "products.json.lock"
-        
-        # Create lock file
-        lock_file.touch(exist_ok=True)
-        
-        with open(lock_file, 'r+') as lock_f:
-            try:
-                fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
-                
-                if site_db.exists():
-                    try:
-                        with open(site_db, 'r') as f:
-                            products = json.load(f)
-                    except json.JSONDecodeError:
-                        log.warning(f"⚠️ Corrupted JSON in website DB, creating new file")
-                        products = []
-                else:
-                    products = []
-                
-                asins = [p.get('asin') for p in products]
-                if product.get('asin') not in asins:
-                    # Serialize product to ensure JSON compatibility (convert Path objects, etc.)
-                    clean_product = serialize_for_json(product)
-                    products.append(clean_product)
-                    with open(site_db, 'w') as f:
-                        json.dump(products, f, indent=2)
-                    log.info(f"🌐 [Parallel] Product {product.get('asin')} added to website")
-                
-                fcntl.flock(lock_f.fileno(), fcntl.LOCK_UN)
-            except Exception as e:
-                log.warning(f"⚠️ Lock error in parallel update: {e}")
+        from catalog_store import SITE
+        from run_catalog import get_run_catalog
+        catalog = get_run_catalog()
+        # Serialize product to ensure JSON compatibility (convert Path objects, etc.)
+        if catalog.add_if_missing(SITE, serialize_for_json(product)):
+            log.info(f"🌐 [Parallel] Product {product.get('asin')} added to website")
                 
     except Exception as e:
         log.warning(f"⚠️ Parallel website update failed: {e}")
@@ -871,6 +962,9 @@ def update_website_parallel(product):
 def deploy_to_site():
     """Automates Cloudflare Pages deployment using the shared deploy script"""
     try:
+        # Every path that deploys must ship the catalog changes made so far this run
+        from run_catalog import flush_run_catalog
+        flush_run_catalog()
         deploy_script = Path(__file__).parent / "tools" / "deploy.sh"
         if not deploy_script.exists():
             log.warning("⚠️ Deploy script not found, falling back to direct wrangler command.")
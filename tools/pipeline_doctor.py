@@ -580,18 +580,14 @@ def apply_yt_improvement(quality_report: dict, dry_run: bool = False) -> list:
 
 
 def load_recent_products() -> list:
-    """Load recently processed products from data files."""
-    for path in [BASE_DIR / "amazing" / "data" / "products.json", DATA_DIR / "products.json"]:
-        if path.exists():
-            try:
-                with open(path) as f:
-                    data = json.load(f)
-                # Return last 10 most recent products that have scripts
-                products_with_scripts = [p for p in data if p.get("script")]
-                return products_with_scripts[-10:]
-            except Exception:
-                pass
-    return []
+    """Load recently processed products from the catalog store."""
+    try:
+        from catalog_store import get_catalog, SITE
+        # Return last 10 most recent products that have scripts
+        products_with_scripts = [p for p in get_catalog().products(SITE) if p.get("script")]
+        return products_with_scripts[-10:]
+    except Exception:
+        return []
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark - renders a synthetic fixture product and reports wall time and
+CPU seconds per video for each render variant. With --profiles it renders the fixture
+under every render profile instead and scores each against the archival output (SSIM).
+
+Usage: python tools/render_benchmark.py [--runs 3] [--images 8] [--profiles]
+"""
+import os
+import re
+import sys
+import math
+import time
+import wave
+import shutil
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+from array import array
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR / "core"))
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
+log = logging.getLogger("RenderBenchmark")
+
+
+def make_fixture(workdir: Path, num_images: int, voice_secs: float) -> dict:
+    """Creates product images of mixed sizes/aspects plus a tone WAV as the voiceover."""
+    from PIL import Image, ImageDraw
+
+    sizes = [(1500, 1500), (2000, 1333), (1200, 1600), (2560, 1440), (1000, 1000)]
+    images = []
+    for i in range(num_images):
+        w, h = sizes[i % len(sizes)]
+        img = Image.new('RGB', (w, h), (30 + i * 20 % 200, 80, 160))
+        draw = ImageDraw.Draw(img)
+        for k in range(0, w, 40):
+            draw.line([(k, 0), (w - k, h)], fill=((k * 7) % 255, (k * 3) % 255, 200), width=6)
+        path = workdir / f"fixture_{i}.jpg"
+        img.save(path, 'JPEG', quality=90)
+        images.append(str(path))
+
+    voice_path = workdir / "fixture_voice.wav"
+    rate = 24000
+    samples = array('h', (int(3000 * math.sin(2 * math.pi * 220 * n / rate)) for n in range(int(rate * voice_secs))))
+    with wave.open(str(voice_path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+
+    product = {'asin': 'BENCHMARK0', 'title': 'Benchmark Fixture', 'images': images}
+    script = {'title': 'Benchmark', 'narration': 'Benchmark narration.', 'hashtags': []}
+    return {'product': product, 'script': script, 'voice_path': str(voice_path)}
+
+
+def _fixture_generator_class():
+    from video_generator import VideoGenerator
+
+    class FixtureVideoGenerator(VideoGenerator):
+        """Copies local fixture files instead of downloading URLs."""
+        def _fetch_images(self, urls: list) -> list:
+            return [Path(url) for url in urls]
+
+    return FixtureVideoGenerator
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def time_render(make_generator, fixture: dict) -> dict:
+    gen = make_generator()
+    # Defeat the render manifest cache so every run really encodes
+    for stale in Path("output_videos").glob(f"video_{fixture['product']['asin']}*"):
+        stale.unlink()
+    cpu0, t0 = _cpu_seconds(), time.perf_counter()
+    video_path = gen.generate(dict(fixture['product']), fixture['script'], voice_path=fixture['voice_path'])
+    wall, cpu = time.perf_counter() - t0, _cpu_seconds() - cpu0
+    if not video_path:
+        raise RuntimeError("Render failed")
+    return {'wall': wall, 'cpu': cpu, 'bytes': Path(video_path).stat().st_size, 'path': video_path}
+
+
+def ssim(path: str, reference: str):
+    """Mean SSIM of path against reference (1.0 = identical), via ffmpeg's ssim filter."""
+    proc = subprocess.run(["ffmpeg", "-hide_banner", "-nostats", "-i", path, "-i", reference,
+                           "-lavfi", "[0:v][1:v]ssim", "-f", "null", "-"],
+                          capture_output=True, text=True)
+    match = re.search(r'All:([0-9.]+)', proc.stderr)
+    return float(match.group(1)) if match else None
+
+
+def benchmark_profiles(Generator, fixture: dict, runs: int):
+    from video_generator import RENDER_PROFILES
+
+    results = {}
+    for name in RENDER_PROFILES:
+        timings = [time_render(lambda: Generator(profile=name), fixture) for _ in range(runs)]
+        keep = Path(f"profile_{name}.mp4")
+        shutil.copy(timings[-1]['path'], keep)
+        results[name] = {
+            'wall': sum(r['wall'] for r in timings) / len(timings),
+            'cpu': sum(r['cpu'] for r in timings) / len(timings),
+            'bytes': timings[-1]['bytes'],
+            'path': str(keep),
+        }
+
+    reference = results['archival']['path']
+    print(f"{'profile':<12}{'wall s':>10}{'cpu s':>10}{'MB':>8}{'SSIM':>10}")
+    for name, r in results.items():
+        score = ssim(r['path'], reference)
+        score_txt = f"{score:.4f}" if score is not None else "n/a"
+        print(f"{name:<12}{r['wall']:>10.2f}{r['cpu']:>10.2f}{r['bytes'] / 1024 / 1024:>8.2f}{score_txt:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VideoGenerator render variants")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--voice-secs", type=float, default=18.0)
+    parser.add_argument("--profiles", action="store_true", help="Compare render profiles instead of render variants")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="render_bench_"))
+    os.chdir(workdir)  # VideoGenerator writes to relative temp/ and output_videos/
+    try:
+        fixture = make_fixture(workdir, args.images, args.voice_secs)
+        Generator = _fixture_generator_class()
+        if args.profiles:
+            print(f"\n🎚️ Render profile benchmark: {args.images} images, {args.voice_secs:.0f}s voice, {args.runs} runs each\n")
+            benchmark_profiles(Generator, fixture, args.runs)
+            return
+
+        import still_frames
+
+        def fresh_stills():
+            # Cold still cache for every run so preparation cost is included
+            shutil.rmtree(still_frames.DEFAULT_STILLS_DIR, ignore_errors=True)
+            return Generator(prepare_stills=True)
+
+        variants = {
+            'ffmpeg-scale (before)': lambda: Generator(prepare_stills=False),
+            'prepared-stills (after)': fresh_stills,
+            'segment-parallel': lambda: Generator(prepare_stills=True, segment_parallel=True),
+        }
+
+        print(f"\n🎬 Render benchmark: {args.images} images, {args.voice_secs:.0f}s voice, {args.runs} runs each\n")
+        print(f"{'variant':<26}{'wall s':>10}{'cpu s':>10}{'MB':>8}")
+        for name, factory in variants.items():
+            results = [time_render(factory, fixture) for _ in range(args.runs)]
+            wall = sum(r['wall'] for r in results) / len(results)
+            cpu = sum(r['cpu'] for r in results) / len(results)
+            mb = results[-1]['bytes'] / 1024 / 1024
+            print(f"{name:<26}{wall:>10.2f}{cpu:>10.2f}{mb:>8.2f}")
+    finally:
+        os.chdir(BASE_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()